@@ -15,6 +15,15 @@ import psutil
 import time
 import json
 import logging
+import os
+import re
+import signal
+import threading
+import cProfile
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from datetime import datetime
 from typing import Dict, List
 import argparse
@@ -26,15 +35,368 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class RingBuffer:
+    """Fixed-size ring buffer with an O(1) running mean"""
+    
+    def __init__(self, size: int):
+        self.values = [0.0] * size
+        self.size = size
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+    
+    def append(self, value: float):
+        """Add a value, overwriting the oldest once the buffer is full"""
+        if self.count == self.size:
+            self.total -= self.values[self.index]
+        else:
+            self.count += 1
+        
+        self.values[self.index] = value
+        self.total += value
+        self.index = (self.index + 1) % self.size
+    
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+class LoadForecaster:
+    """Seasonal forecaster: a learned daily profile plus a damped deviation from it, O(1) per sample"""
+    
+    SEASON_SECONDS = 86400
+    
+    def __init__(self, interval: int, alpha: float = 0.3, gamma: float = 0.3,
+                 deviation_halflife_minutes: float = 30, window_seconds: int = 3600):
+        self.interval = interval
+        self.alpha = alpha  # deviation smoothing
+        self.gamma = gamma  # daily profile smoothing, per day
+        self.deviation_halflife_minutes = deviation_halflife_minutes
+        
+        # One profile slot per sample interval across the day; a slot starts at its first sample
+        # so a single day of history already predicts the daily ramp
+        self.profile = [None] * max(1, self.SEASON_SECONDS // interval)
+        self.level = None      # smoothed recent value, used where the profile has no history yet
+        self.deviation = 0.0   # how far today runs above or below the usual profile
+        
+        # Forecasts awaiting their target time, and the absolute errors of those already due
+        self.pending = deque()
+        self.errors = RingBuffer(max(1, window_seconds // interval))
+    
+    def _slot(self, timestamp: float) -> int:
+        return int(timestamp % self.SEASON_SECONDS) // self.interval % len(self.profile)
+    
+    def _season(self, slot: int) -> float:
+        """Get the profile at a slot, or its nearest learned neighbour when collection drifted past it"""
+        for offset in (0, -1, 1, -2, 2):
+            value = self.profile[(slot + offset) % len(self.profile)]
+            if value is not None:
+                return value
+        return None
+    
+    def update(self, value: float, timestamp: float):
+        """Score due forecasts, then fold a new sample into the deviation and daily profile"""
+        while self.pending and self.pending[0][0] <= timestamp + self.interval / 2:
+            self.errors.append(abs(value - self.pending.popleft()[1]))
+        
+        slot = self._slot(timestamp)
+        season = self._season(slot)
+        self.level = value if self.level is None else self.alpha * value + (1 - self.alpha) * self.level
+        
+        if season is None:
+            self.profile[slot] = value
+        else:
+            self.deviation = self.alpha * (value - season) + (1 - self.alpha) * self.deviation
+            current = self.profile[slot]
+            self.profile[slot] = value if current is None else self.gamma * value + (1 - self.gamma) * current
+    
+    def forecast(self, timestamp: float, minutes: int) -> float:
+        """Predict the value the given number of minutes after timestamp"""
+        if self.level is None:
+            return 0.0
+        
+        season = self._season(self._slot(timestamp + minutes * 60))
+        if season is None:
+            prediction = self.level
+        else:
+            # Today's deviation from the profile fades as the horizon grows
+            prediction = season + self.deviation * 0.5 ** (minutes / self.deviation_halflife_minutes)
+        
+        prediction = max(0.0, prediction)
+        self.pending.append((timestamp + minutes * 60, prediction))
+        return prediction
+    
+    def mean_error(self) -> float:
+        """Mean absolute error of forecasts that came due within the error window"""
+        return self.errors.mean()
+    
+    def to_dict(self) -> Dict:
+        return {
+            'interval': self.interval,
+            'profile': self.profile,
+            'level': self.level,
+            'deviation': self.deviation
+        }
+    
+    def load_dict(self, data: Dict) -> bool:
+        """Restore learned state saved by to_dict; returns False if it was saved at another interval"""
+        if data.get('interval') != self.interval or len(data.get('profile', [])) != len(self.profile):
+            return False
+        self.profile = data['profile']
+        self.level = data['level']
+        self.deviation = data['deviation']
+        return True
+
+# Duration histogram bucket upper bounds in seconds
+DURATION_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+class Histogram:
+    """Cumulative fixed-bucket histogram of durations in seconds"""
+    
+    def __init__(self, buckets: List[float] = DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, value: float):
+        """Record a single duration"""
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+class AgentTelemetry:
+    """Times the agent's own collectors and publishes, and tracks its CPU and memory"""
+    
+    def __init__(self, instance_id: str, cpu_budget: float = None):
+        self.instance_id = instance_id
+        self.cpu_budget = cpu_budget
+        self.histograms = {}
+        self._emitted_counts = {}  # Stage -> bucket counts already published
+        self.process = psutil.Process()
+        self.process.cpu_percent(interval=None)  # Prime CPU sampling
+        
+        # Separate handle so budget checks keep their own interval from published CPU
+        self._budget_process = psutil.Process()
+        self._budget_process.cpu_percent(interval=None)
+    
+    @contextmanager
+    def timer(self, stage: str):
+        """Time a block of agent work under the given stage name"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(time.perf_counter() - start_time)
+    
+    def collect_agent_metrics(self) -> List[Dict]:
+        """Build XYZ/Agent metrics for stage durations and agent resource usage"""
+        metrics = []
+        dimensions = [{'Name': 'InstanceId', 'Value': self.instance_id}]
+        
+        # Publish only the samples recorded since the last call, as value/count pairs
+        for stage, histogram in self.histograms.items():
+            emitted = self._emitted_counts.get(stage, [0] * len(histogram.counts))
+            values, counts = [], []
+            for index, count in enumerate(histogram.counts):
+                if count > emitted[index]:
+                    upper = histogram.buckets[index] if index < len(histogram.buckets) else histogram.max
+                    values.append(upper * 1000)
+                    counts.append(count - emitted[index])
+            self._emitted_counts[stage] = list(histogram.counts)
+            
+            if values:
+                metrics.append({
+                    'MetricName': 'StageDuration',
+                    'Values': values,
+                    'Counts': counts,
+                    'Unit': 'Milliseconds',
+                    'Dimensions': dimensions + [{'Name': 'Stage', 'Value': stage}]
+                })
+        
+        cpu_percent = self.process.cpu_percent(interval=None)
+        rss = self.process.memory_info().rss
+        metrics.append({
+            'MetricName': 'AgentCPUUtilization',
+            'Value': cpu_percent,
+            'Unit': 'Percent',
+            'Dimensions': dimensions
+        })
+        metrics.append({
+            'MetricName': 'AgentMemoryRSS',
+            'Value': rss,
+            'Unit': 'Bytes',
+            'Dimensions': dimensions
+        })
+        
+        return metrics
+    
+    def check_cpu_budget(self):
+        """Warn when the agent used more CPU than its budget since the last check"""
+        if self.cpu_budget is None:
+            return
+        
+        cpu_percent = self._budget_process.cpu_percent(interval=None)
+        if cpu_percent > self.cpu_budget:
+            logger.warning(f"Agent CPU {cpu_percent:.2f}% exceeds budget of {self.cpu_budget:.2f}%")
+
+class AgentProfiler:
+    """Runs cProfile and tracemalloc, dumping snapshots when the agent receives SIGUSR1"""
+    
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        
+        tracemalloc.start()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        signal.signal(signal.SIGUSR1, self._dump)
+        logger.info(f"Profiling enabled. Send SIGUSR1 to PID {os.getpid()} to write snapshots to {output_dir}")
+    
+    def _dump(self, signum, frame):
+        """Write cProfile stats and a tracemalloc snapshot"""
+        stamp = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
+        profile_path = os.path.join(self.output_dir, f'agent-{stamp}.prof')
+        snapshot_path = os.path.join(self.output_dir, f'agent-{stamp}.tracemalloc')
+        
+        self.profiler.disable()
+        try:
+            self.profiler.dump_stats(profile_path)
+        finally:
+            self.profiler.enable()
+        tracemalloc.take_snapshot().dump(snapshot_path)
+        
+        logger.info(f"Wrote profile snapshots: {profile_path}, {snapshot_path}")
+
+class MetricsExpositionServer:
+    """Serves the latest metrics in Prometheus text format from a pre-rendered buffer"""
+    
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+    
+    def __init__(self, bind: str = '127.0.0.1', port: int = 9102):
+        self.payload = b''
+        
+        exposition = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                
+                # Read the buffer once; update() swaps it without locking
+                payload = exposition.payload
+                self.send_response(200)
+                self.send_header('Content-Type', exposition.CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                pass  # Scrapes every second would flood the agent log
+        
+        self.server = ThreadingHTTPServer((bind, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Serving Prometheus metrics on http://{bind}:{port}/metrics")
+    
+    def update(self, payload: bytes):
+        """Replace the served buffer with a freshly rendered one"""
+        self.payload = payload
+    
+    @staticmethod
+    def _name(*parts: str) -> str:
+        """Convert CloudWatch-style names to a Prometheus metric name"""
+        name = '_'.join(re.sub(r'(?<=[a-z0-9])(?=[A-Z])', '_', part) for part in parts)
+        return re.sub(r'[^a-zA-Z0-9_]', '_', name).lower()
+    
+    @staticmethod
+    def _labels(labels: Dict[str, str]) -> str:
+        if not labels:
+            return ''
+        
+        pairs = []
+        for key, value in labels.items():
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            pairs.append(f'{MetricsExpositionServer._name(key)}="{value}"')
+        return '{' + ','.join(pairs) + '}'
+    
+    @classmethod
+    def render(cls, namespace: str, metrics: List[Dict], histograms: Dict[str, Dict]) -> bytes:
+        """Render sample metrics and histograms in Prometheus text format"""
+        lines = []
+        
+        samples = {}
+        for metric in metrics:
+            if 'Value' in metric:
+                samples.setdefault(cls._name(namespace, metric['MetricName']), []).append(metric)
+        
+        for name, group in samples.items():
+            lines.append(f'# TYPE {name} gauge')
+            for metric in group:
+                labels = {d['Name']: d['Value'] for d in metric.get('Dimensions', [])}
+                lines.append(f"{name}{cls._labels(labels)} {float(metric['Value'])}")
+        
+        # histograms: metric name -> (labels -> Histogram)
+        for name, series in histograms.items():
+            lines.append(f'# TYPE {name} histogram')
+            for labels, histogram in series.items():
+                labels = dict(labels)
+                cumulative = 0
+                for index, count in enumerate(histogram.counts):
+                    cumulative += count
+                    le = str(histogram.buckets[index]) if index < len(histogram.buckets) else '+Inf'
+                    lines.append(f"{name}_bucket{cls._labels({**labels, 'le': le})} {cumulative}")
+                lines.append(f"{name}_sum{cls._labels(labels)} {histogram.total}")
+                lines.append(f"{name}_count{cls._labels(labels)} {histogram.count}")
+        
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
 class CustomMetricsCollector:
     """Collects and publishes custom metrics to CloudWatch"""
     
-    def __init__(self, region='us-east-1', namespace='XYZ/Application'):
+    def __init__(self, region='us-east-1', namespace='XYZ/Application',
+                 interval=300, forecast_minutes=None, agent_namespace=None, cpu_budget=None,
+                 forecast_state=None, asg_name=None):
         self.region = region
         self.namespace = namespace
         self.cloudwatch = boto3.client('cloudwatch', region_name=region)
         self.instance_id = self._get_instance_id()
         
+        # Self-telemetry, published to agent_namespace when given
+        self.agent_namespace = agent_namespace
+        self.telemetry = AgentTelemetry(self.instance_id, cpu_budget)
+        
+        # Local Prometheus exposition (attach a MetricsExpositionServer to enable)
+        self.exposition = None
+        self.response_times = Histogram()
+        
+        # Predictive load forecasting (disabled unless a horizon is given)
+        self.forecast_minutes = forecast_minutes
+        self.forecast_state = forecast_state  # Local path or s3://bucket/key holding the learned profiles
+        self.forecasters = {}
+        self.asg_name = None
+        self.autoscaling = None
+        self._fleet_size = 1
+        if forecast_minutes:
+            self.forecasters = {
+                'RequestRate': LoadForecaster(interval),
+                'CPUUtilization': LoadForecaster(interval)
+            }
+            psutil.cpu_percent(interval=None)  # Prime CPU sampling for the first cycle
+            self.autoscaling = boto3.client('autoscaling', region_name=region)
+            self.asg_name = asg_name or self._get_asg_name()
+            if self.forecast_state:
+                self.load_forecast_state()
+        self._last_accesses = None
+        
     def _get_instance_id(self) -> str:
         """Get the current EC2 instance ID"""
         try:
@@ -46,6 +408,33 @@ class CustomMetricsCollector:
         except:
             return 'unknown-instance'
     
+    def _get_asg_name(self) -> str:
+        """Get the Auto Scaling Group this instance belongs to, for fleet-level forecasts"""
+        try:
+            instances = self.autoscaling.describe_auto_scaling_instances(
+                InstanceIds=[self.instance_id]
+            )['AutoScalingInstances']
+            return instances[0]['AutoScalingGroupName'] if instances else None
+        except Exception as e:
+            logger.warning(f"Could not determine Auto Scaling Group: {str(e)}")
+            return None
+    
+    def _get_fleet_size(self) -> int:
+        """Get the number of InService instances sharing the load, keeping the last count on errors"""
+        if not self.asg_name:
+            return 1
+        
+        try:
+            groups = self.autoscaling.describe_auto_scaling_groups(
+                AutoScalingGroupNames=[self.asg_name]
+            )['AutoScalingGroups']
+            if groups:
+                in_service = sum(1 for i in groups[0]['Instances'] if i['LifecycleState'] == 'InService')
+                self._fleet_size = max(1, in_service)
+        except Exception as e:
+            logger.warning(f"Could not get fleet size, using {self._fleet_size}: {str(e)}")
+        return self._fleet_size
+    
     def collect_system_metrics(self) -> List[Dict]:
         """Collect system-level performance metrics"""
         metrics = []
@@ -132,6 +521,7 @@ class CustomMetricsCollector:
             
             # Simulate application response time
             response_time = self._measure_response_time()
+            self.response_times.observe(response_time)
             metrics.append({
                 'MetricName': 'ApplicationResponseTime',
                 'Value': response_time,
@@ -159,6 +549,119 @@ class CustomMetricsCollector:
             
         return metrics
     
+    def collect_forecast_metrics(self) -> List[Dict]:
+        """Update fleet demand forecasts and predict request rate and CPU ahead of time"""
+        metrics = []
+        
+        if not self.forecasters:
+            return metrics
+        
+        try:
+            now = time.time()
+            samples = {
+                'RequestRate': (self._get_request_rate(now), 'Count/Second'),
+                'CPUUtilization': (psutil.cpu_percent(interval=None), 'Percent')
+            }
+            
+            # Per-instance load falls as the fleet grows, so learn fleet demand (per-instance load
+            # times InService instances), which does not depend on the capacity the forecast drives
+            fleet_size = self._get_fleet_size()
+            
+            for signal_name, (value, unit) in samples.items():
+                if value is None:
+                    continue
+                
+                forecaster = self.forecasters[signal_name]
+                forecaster.update(value * fleet_size, now)
+                prediction = forecaster.forecast(now, self.forecast_minutes)
+                error = forecaster.mean_error()
+                
+                # Fleet demand per ASG (every instance reports the same estimate, so alarm on the Average),
+                # and the per-instance share it implies at the current fleet size
+                dimension_sets = [([{'Name': 'InstanceId', 'Value': self.instance_id}], fleet_size)]
+                if self.asg_name:
+                    dimension_sets.append(([{'Name': 'AutoScalingGroupName', 'Value': self.asg_name}], 1))
+                
+                for dimensions, divisor in dimension_sets:
+                    dimensions = dimensions + [{'Name': 'Signal', 'Value': signal_name}]
+                    metrics.append({
+                        'MetricName': 'PredictedLoad',
+                        'Value': prediction / divisor,
+                        'Unit': unit,
+                        'Dimensions': dimensions
+                    })
+                    metrics.append({
+                        'MetricName': 'PredictedLoadError',
+                        'Value': error / divisor,
+                        'Unit': unit,
+                        'Dimensions': dimensions
+                    })
+            
+            logger.info(f"Collected {len(metrics)} forecast metrics ({self.forecast_minutes} min ahead)")
+            
+        except Exception as e:
+            logger.error(f"Error collecting forecast metrics: {str(e)}")
+            
+        return metrics
+    
+    def load_forecast_state(self):
+        """Seed the forecasters with profiles learned before a restart or by other instances"""
+        try:
+            if self.forecast_state.startswith('s3://'):
+                bucket, key = self.forecast_state[5:].split('/', 1)
+                s3 = boto3.client('s3', region_name=self.region)
+                state = json.loads(s3.get_object(Bucket=bucket, Key=key)['Body'].read())
+            elif os.path.exists(self.forecast_state):
+                with open(self.forecast_state) as f:
+                    state = json.load(f)
+            else:
+                return
+        except Exception as e:
+            logger.warning(f"Could not load forecast state from {self.forecast_state}: {str(e)}")
+            return
+        
+        for signal_name, forecaster in self.forecasters.items():
+            if signal_name in state and not forecaster.load_dict(state[signal_name]):
+                logger.warning(f"Ignoring {signal_name} forecast state saved at a different interval")
+        logger.info(f"Loaded forecast state from {self.forecast_state}")
+    
+    def save_forecast_state(self):
+        """Persist the learned profiles so restarts and new instances keep the daily pattern"""
+        state = json.dumps({signal_name: f.to_dict() for signal_name, f in self.forecasters.items()})
+        try:
+            if self.forecast_state.startswith('s3://'):
+                bucket, key = self.forecast_state[5:].split('/', 1)
+                s3 = boto3.client('s3', region_name=self.region)
+                s3.put_object(Bucket=bucket, Key=key, Body=state.encode('utf-8'))
+            else:
+                temp_path = f"{self.forecast_state}.tmp"
+                with open(temp_path, 'w') as f:
+                    f.write(state)
+                os.replace(temp_path, self.forecast_state)
+        except Exception as e:
+            logger.error(f"Error saving forecast state to {self.forecast_state}: {str(e)}")
+    
+    def _get_request_rate(self, now: float) -> float:
+        """Get requests per second from Apache mod_status since the last call"""
+        try:
+            response = requests.get('http://localhost/server-status?auto', timeout=2)
+            accesses = None
+            for line in response.text.splitlines():
+                if line.startswith('Total Accesses:'):
+                    accesses = int(line.split(':', 1)[1])
+                    break
+        except:
+            return None
+        
+        if accesses is None:
+            return None
+        
+        previous = self._last_accesses
+        self._last_accesses = (accesses, now)
+        if previous is None or now <= previous[1] or accesses < previous[0]:
+            return None  # First sample or Apache restarted
+        return (accesses - previous[0]) / (now - previous[1])
+    
     def _check_application_health(self) -> bool:
         """Check if the web application is responding"""
         try:
@@ -200,7 +703,7 @@ class CustomMetricsCollector:
             return base_error_rate + 2.0
         return base_error_rate
     
-    def publish_metrics(self, metrics: List[Dict]) -> bool:
+    def publish_metrics(self, metrics: List[Dict], namespace: str = None) -> bool:
         """Publish metrics to CloudWatch"""
         if not metrics:
             logger.warning("No metrics to publish")
@@ -217,10 +720,11 @@ class CustomMetricsCollector:
             for i in range(0, len(metrics), batch_size):
                 batch = metrics[i:i + batch_size]
                 
-                response = self.cloudwatch.put_metric_data(
-                    Namespace=self.namespace,
-                    MetricData=batch
-                )
+                with self.telemetry.timer('publish_batch'):
+                    response = self.cloudwatch.put_metric_data(
+                        Namespace=namespace or self.namespace,
+                        MetricData=batch
+                    )
                 
                 logger.info(f"Published batch of {len(batch)} metrics")
             
@@ -231,25 +735,62 @@ class CustomMetricsCollector:
             logger.error(f"Error publishing metrics: {str(e)}")
             return False
     
-    def collect_and_publish_all(self) -> bool:
+    def collect_and_publish_all(self, publish: bool = True) -> bool:
         """Collect all metrics and publish to CloudWatch"""
         logger.info("Starting metrics collection...")
         
         all_metrics = []
+        success = True
         
-        # Collect system metrics
-        system_metrics = self.collect_system_metrics()
-        all_metrics.extend(system_metrics)
-        
-        # Collect application metrics
-        app_metrics = self.collect_application_metrics()
-        all_metrics.extend(app_metrics)
+        with self.telemetry.timer('cycle'):
+            # Collect system metrics
+            with self.telemetry.timer('system'):
+                system_metrics = self.collect_system_metrics()
+            all_metrics.extend(system_metrics)
+            
+            # Collect application metrics
+            with self.telemetry.timer('application'):
+                app_metrics = self.collect_application_metrics()
+            all_metrics.extend(app_metrics)
+            
+            # Collect predicted load
+            with self.telemetry.timer('forecast'):
+                forecast_metrics = self.collect_forecast_metrics()
+            all_metrics.extend(forecast_metrics)
+            
+            # Refresh the local exposition buffer
+            if self.exposition:
+                with self.telemetry.timer('render'):
+                    self.exposition.update(self.render_exposition(all_metrics))
+            
+            # Publish all metrics
+            if publish:
+                with self.telemetry.timer('publish'):
+                    success = self.publish_metrics(all_metrics)
+                if self.forecasters and self.forecast_state:
+                    self.save_forecast_state()
         
-        # Publish all metrics
-        success = self.publish_metrics(all_metrics)
+        # Publish the agent's own telemetry
+        if publish and self.agent_namespace:
+            self.publish_metrics(self.telemetry.collect_agent_metrics(), self.agent_namespace)
+        self.telemetry.check_cpu_budget()
         
         logger.info(f"Metrics collection completed. Success: {success}")
         return success
+    
+    def render_exposition(self, metrics: List[Dict]) -> bytes:
+        """Render the latest samples and latency histograms for the local /metrics endpoint"""
+        instance = (('InstanceId', self.instance_id),)
+        histograms = {
+            MetricsExpositionServer._name(self.namespace, 'ApplicationResponseTimeSeconds'): {
+                instance: self.response_times
+            },
+            'xyz_agent_stage_duration_seconds': {
+                instance + (('Stage', stage),): histogram
+                for stage, histogram in self.telemetry.histograms.items()
+            }
+        }
+        return MetricsExpositionServer.render(self.namespace, metrics, histograms)
 
 def main():
     """Main execution function"""
@@ -277,23 +818,92 @@ def main():
         default=300,
         help='Interval in seconds for continuous mode (default: 300)'
     )
+    parser.add_argument(
+        '--forecast-minutes',
+        type=int,
+        help='Publish a PredictedLoad metric this many minutes ahead (continuous mode)'
+    )
+    parser.add_argument(
+        '--forecast-state',
+        help='File or s3://bucket/key to persist learned load profiles in (shared across the fleet on S3)'
+    )
+    parser.add_argument(
+        '--asg-name',
+        help='Auto Scaling Group for fleet-level PredictedLoad (default: looked up for this instance)'
+    )
+    parser.add_argument(
+        '--agent-metrics',
+        action='store_true',
+        help='Publish agent timing and resource usage to the XYZ/Agent namespace'
+    )
+    parser.add_argument(
+        '--cpu-budget',
+        type=float,
+        help='Warn when the agent uses more than this CPU percent between cycles'
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        help='Serve the latest metrics in Prometheus format on this port (continuous mode)'
+    )
+    parser.add_argument(
+        '--metrics-bind',
+        default='127.0.0.1',
+        help='Address for the Prometheus metrics endpoint (default: 127.0.0.1)'
+    )
+    parser.add_argument(
+        '--collect-interval',
+        type=int,
+        help='Refresh local metrics this often, publishing to CloudWatch every --interval'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Enable cProfile/tracemalloc and dump snapshots on SIGUSR1'
+    )
+    parser.add_argument(
+        '--profile-dir',
+        default='/tmp/xyz-metrics-profile',
+        help='Directory for profile snapshots (default: /tmp/xyz-metrics-profile)'
+    )
     
     args = parser.parse_args()
     
+    # Local collection can run more often than CloudWatch publishing
+    collect_interval = min(args.collect_interval or args.interval, args.interval)
+    
     # Initialize metrics collector
     collector = CustomMetricsCollector(
         region=args.region,
-        namespace=args.namespace
+        namespace=args.namespace,
+        interval=collect_interval,
+        forecast_minutes=args.forecast_minutes,
+        agent_namespace='XYZ/Agent' if args.agent_metrics else None,
+        cpu_budget=args.cpu_budget,
+        forecast_state=args.forecast_state,
+        asg_name=args.asg_name
     )
     
+    if args.profile:
+        AgentProfiler(args.profile_dir)
+    
     if args.continuous:
         logger.info(f"Starting continuous metrics collection (interval: {args.interval}s)")
         
+        if args.metrics_port:
+            collector.exposition = MetricsExpositionServer(args.metrics_bind, args.metrics_port)
+        
+        next_publish = 0
+        
         while True:
             try:
-                collector.collect_and_publish_all()
-                logger.info(f"Sleeping for {args.interval} seconds...")
-                time.sleep(args.interval)
+                publish = time.time() >= next_publish
+                if publish:
+                    next_publish = time.time() + args.interval
+                
+                collector.collect_and_publish_all(publish=publish)
+                logger.info(f"Sleeping for {collect_interval} seconds...")
+                time.sleep(collect_interval)
                 
             except KeyboardInterrupt:
                 logger.info("Received interrupt signal. Stopping...")
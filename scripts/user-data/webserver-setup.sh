@@ -75,6 +75,19 @@ sed -i "s/AZ_PLACEHOLDER/$AZ/g" /var/www/html/index.html
 # Create a health check endpoint
 echo "OK" > /var/www/html/health.html
 
+# Tag every response with the serving instance so load tests can attribute traffic per backend
+cat > /etc/httpd/conf.d/instance-id.conf << EOF
+Header always set X-Instance-Id "$INSTANCE_ID"
+EOF
+
+# Expose Apache request counters locally for the custom metrics collector
+cat > /etc/httpd/conf.d/server-status.conf << 'EOF'
+<Location "/server-status">
+    SetHandler server-status
+    Require local
+</Location>
+EOF
+
 # Install and configure CloudWatch agent
 wget https://s3.amazonaws.com/amazoncloudwatch-agent/amazon_linux/amd64/latest/amazon-cloudwatch-agent.rpm
 rpm -U ./amazon-cloudwatch-agent.rpm
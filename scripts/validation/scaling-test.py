@@ -17,9 +17,16 @@ import json
 import logging
 import argparse
 import statistics
-from datetime import datetime, timedelta
+import bisect
+import math
+import os
+import hashlib
+import hmac
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Tuple
 import concurrent.futures
+import socket
+import socketserver
 
 # Configure logging
 logging.basicConfig(
@@ -28,36 +35,1023 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class MetricsQuery:
+    """Batched CloudWatch GetMetricData queries with a small TTL cache"""
+    
+    PERIOD = 60  # 1-minute resolution
+    MAX_CACHE_ENTRIES = 32
+    CUSTOM_NAMESPACE = 'XYZ/Application'
+    CUSTOM_METRICS = [
+        'ApplicationResponseTime',
+        'ApplicationErrorRate',
+        'ActiveSessions',
+        'MemoryUtilization'
+    ]
+    
+    def __init__(self, cloudwatch, asg_name: str, load_balancer: str = None,
+                 target_group: str = None, cache_ttl: int = 60):
+        self.cloudwatch = cloudwatch
+        self.asg_name = asg_name
+        self.load_balancer = load_balancer  # e.g. app/XYZ-Corp-LoadBalancer/1234567890abcdef
+        self.target_group = target_group    # e.g. targetgroup/XYZ-Corp-TG/1234567890123456
+        self.cache_ttl = cache_ttl
+        self._cache = {}
+        self.api_calls = 0
+    
+    def build_queries(self) -> List[Dict]:
+        """Build the MetricDataQueries for every metric the tester reports on"""
+        queries = [
+            self._stat_query('cpu', 'AWS/EC2', 'CPUUtilization', 'Average', [
+                {'Name': 'AutoScalingGroupName', 'Value': self.asg_name}
+            ])
+        ]
+        
+        if self.load_balancer:
+            lb_dimensions = [{'Name': 'LoadBalancer', 'Value': self.load_balancer}]
+            queries.append(self._stat_query(
+                'requests', 'AWS/ApplicationELB', 'RequestCount', 'Sum', lb_dimensions
+            ))
+            queries.append(self._stat_query(
+                'latency', 'AWS/ApplicationELB', 'TargetResponseTime', 'Average', lb_dimensions
+            ))
+            
+            if self.target_group:
+                queries.append(self._stat_query(
+                    'healthy', 'AWS/ApplicationELB', 'HealthyHostCount', 'Average',
+                    [{'Name': 'TargetGroup', 'Value': self.target_group}] + lb_dimensions
+                ))
+        
+        # Custom metrics are published per InstanceId, so average across instances
+        for index, metric_name in enumerate(self.CUSTOM_METRICS):
+            search = (f"SEARCH('{{{self.CUSTOM_NAMESPACE},InstanceId}} "
+                      f"MetricName=\"{metric_name}\"', 'Average', {self.PERIOD})")
+            queries.append({
+                'Id': f'custom{index}',
+                'Expression': f'AVG({search})',
+                'Label': metric_name,
+                'ReturnData': True
+            })
+        
+        return queries
+    
+    def _stat_query(self, query_id: str, namespace: str, metric_name: str,
+                    stat: str, dimensions: List[Dict]) -> Dict:
+        """Build a single MetricStat query"""
+        return {
+            'Id': query_id,
+            'MetricStat': {
+                'Metric': {
+                    'Namespace': namespace,
+                    'MetricName': metric_name,
+                    'Dimensions': dimensions
+                },
+                'Period': self.PERIOD,
+                'Stat': stat
+            },
+            'Label': metric_name,
+            'ReturnData': True
+        }
+    
+    def _align(self, timestamp: datetime) -> datetime:
+        """Round a timestamp down to the query period so nearby calls share a window"""
+        epoch = int(timestamp.replace(tzinfo=timezone.utc).timestamp())
+        return datetime.fromtimestamp(epoch - epoch % self.PERIOD, tz=timezone.utc)
+    
+    def fetch(self, start_time: datetime, end_time: datetime = None) -> Dict[str, Dict]:
+        """Fetch all metric series for a time window, keyed by metric name"""
+        end_time = self._align(end_time or datetime.utcnow())
+        start_time = self._align(start_time)
+        queries = self.build_queries()
+        
+        key = (tuple(sorted(q['Id'] for q in queries)), self.load_balancer,
+               self.target_group, start_time, end_time)
+        cached = self._cache.get(key)
+        if cached and time.time() - cached[0] < self.cache_ttl:
+            return cached[1]
+        
+        labels = {q['Id']: q['Label'] for q in queries}
+        series = {label: {'timestamps': [], 'values': []} for label in labels.values()}
+        
+        paginator = self.cloudwatch.get_paginator('get_metric_data')
+        for page in paginator.paginate(MetricDataQueries=queries,
+                                       StartTime=start_time,
+                                       EndTime=end_time,
+                                       ScanBy='TimestampAscending'):
+            self.api_calls += 1
+            for result in page['MetricDataResults']:
+                entry = series[labels[result['Id']]]
+                entry['timestamps'].extend(ts.isoformat() for ts in result['Timestamps'])
+                entry['values'].extend(result['Values'])
+        
+        self._store(key, series)
+        return series
+    
+    def _store(self, key: Tuple, series: Dict):
+        """Store a result, dropping expired and then oldest entries to bound the cache"""
+        now = time.time()
+        self._cache = {k: v for k, v in self._cache.items() if now - v[0] < self.cache_ttl}
+        while len(self._cache) >= self.MAX_CACHE_ENTRIES:
+            del self._cache[min(self._cache, key=lambda k: self._cache[k][0])]
+        self._cache[key] = (now, series)
+
+# Latency bucket upper bounds: 0.5 ms growing 5% per bucket up to ~100 s
+LATENCY_BUCKETS = [0.0005 * 1.05 ** i for i in range(250)]
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram that can be merged across workers"""
+    
+    def __init__(self):
+        self.counts = {}  # bucket index -> count
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+    
+    def record(self, value: float):
+        """Record a single latency in seconds"""
+        index = min(bisect.bisect_left(LATENCY_BUCKETS, value), len(LATENCY_BUCKETS) - 1)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    def merge(self, other: 'LatencyHistogram'):
+        """Add another histogram's samples to this one"""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+    
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def to_dict(self) -> Dict:
+        """Serialize sparse bucket counts for transfer between hosts"""
+        return {'counts': self.counts, 'count': self.count, 'total': self.total,
+                'min': self.min, 'max': self.max}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LatencyHistogram':
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data['counts'].items()}
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
+    
+    def percentile(self, percent: float) -> float:
+        """Estimate a percentile from bucket upper bounds (within 5%)"""
+        if not self.count:
+            return 0.0
+        
+        rank = percent / 100.0 * self.count
+        cumulative = 0
+        for index in sorted(self.counts):
+            cumulative += self.counts[index]
+            if cumulative >= rank:
+                return max(self.min, min(LATENCY_BUCKETS[index], self.max))
+        return self.max
+
+class LoadStats:
+    """Per-second, per-backend request counts and latency histograms for a load test"""
+    
+    def __init__(self, start_time: float = None):
+        self.start_time = start_time or time.time()
+        self.timeline = {}  # second offset -> backend -> {'success', 'failed', 'latency'}
+        self.generator_health = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _new_bucket() -> Dict:
+        return {'success': 0, 'failed': 0, 'latency': LatencyHistogram()}
+    
+    def record(self, timestamp: float, backend: str, response_time: float, success: bool):
+        """Record one request against the backend instance that served it"""
+        second = int(timestamp - self.start_time)
+        
+        with self._lock:
+            backends = self.timeline.setdefault(second, {})
+            bucket = backends.get(backend)
+            if bucket is None:
+                bucket = backends[backend] = self._new_bucket()
+            
+            if success:
+                bucket['success'] += 1
+                bucket['latency'].record(response_time)
+            else:
+                bucket['failed'] += 1
+    
+    def merge(self, other: 'LoadStats'):
+        """Merge another run's timeline, aligned on wall-clock seconds"""
+        offset = int(other.start_time - self.start_time)
+        
+        with self._lock:
+            for second, backends in other.timeline.items():
+                target = self.timeline.setdefault(second + offset, {})
+                for backend, bucket in backends.items():
+                    merged = target.get(backend)
+                    if merged is None:
+                        merged = target[backend] = self._new_bucket()
+                    merged['success'] += bucket['success']
+                    merged['failed'] += bucket['failed']
+                    merged['latency'].merge(bucket['latency'])
+    
+    def add_bucket(self, second: int, backend: str, bucket: Dict):
+        """Merge one backend's counts for one second, e.g. streamed from a remote worker"""
+        with self._lock:
+            backends = self.timeline.setdefault(second, {})
+            merged = backends.get(backend)
+            if merged is None:
+                merged = backends[backend] = self._new_bucket()
+            merged['success'] += bucket['success']
+            merged['failed'] += bucket['failed']
+            merged['latency'].merge(bucket['latency'])
+    
+    def drain(self, before_second: int = None) -> Dict[int, Dict]:
+        """Remove and return completed seconds (all seconds if no limit is given)"""
+        with self._lock:
+            seconds = [s for s in self.timeline if before_second is None or s < before_second]
+            return {second: self.timeline.pop(second) for second in sorted(seconds)}
+    
+    def by_backend(self, first_second: int = None, last_second: int = None) -> Dict[str, Dict]:
+        """Aggregate the timeline per backend, optionally over a range of seconds"""
+        totals = {}
+        
+        with self._lock:
+            for second, backends in self.timeline.items():
+                if first_second is not None and second < first_second:
+                    continue
+                if last_second is not None and second > last_second:
+                    continue
+                
+                for backend, bucket in backends.items():
+                    total = totals.get(backend)
+                    if total is None:
+                        total = totals[backend] = self._new_bucket()
+                    total['success'] += bucket['success']
+                    total['failed'] += bucket['failed']
+                    total['latency'].merge(bucket['latency'])
+        
+        return totals
+    
+    def totals(self) -> Dict:
+        """Aggregate the whole run across all backends"""
+        total = self._new_bucket()
+        for bucket in self.by_backend().values():
+            total['success'] += bucket['success']
+            total['failed'] += bucket['failed']
+            total['latency'].merge(bucket['latency'])
+        return total
+
+class GeneratorHealthMonitor:
+    """Samples the load generator's own CPU, socket usage and send-schedule lag during a run"""
+    
+    SOCKET_EXHAUSTION_ERRORS = ('Cannot assign requested address', 'Too many open files')
+    
+    def __init__(self, sample_interval: float = 1.0):
+        self.sample_interval = sample_interval
+        self.schedule_lag = LatencyHistogram()
+        self.cpu_samples = []
+        self.port_samples = []
+        self.socket_errors = 0
+        self.port_range = self._ephemeral_port_range()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def record_send(self, intended_time: float, actual_time: float):
+        """Record how late the generator woke up to send a request relative to its pacing schedule"""
+        with self._lock:
+            self.schedule_lag.record(max(0.0, actual_time - intended_time))
+    
+    def record_error(self, error: Exception):
+        """Count errors caused by running out of sockets or ephemeral ports"""
+        message = str(error)
+        if any(text in message for text in self.SOCKET_EXHAUSTION_ERRORS):
+            with self._lock:
+                self.socket_errors += 1
+    
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+    
+    def _sample_loop(self):
+        """Sample process CPU (as a share of one core, since the GIL caps us there) and port usage"""
+        last_wall = time.time()
+        last_cpu = time.process_time()
+        
+        while not self._stop_event.wait(self.sample_interval):
+            wall, cpu = time.time(), time.process_time()
+            if wall > last_wall:
+                self.cpu_samples.append((cpu - last_cpu) / (wall - last_wall) * 100)
+            last_wall, last_cpu = wall, cpu
+            
+            ports = self._ephemeral_ports_in_use()
+            if ports is not None:
+                self.port_samples.append(ports)
+    
+    @staticmethod
+    def _ephemeral_port_range() -> Tuple[int, int]:
+        """Get the local ephemeral port range (Linux only)"""
+        try:
+            with open('/proc/sys/net/ipv4/ip_local_port_range') as f:
+                low, high = f.read().split()
+                return int(low), int(high)
+        except (OSError, ValueError):
+            return None
+    
+    def _ephemeral_ports_in_use(self) -> int:
+        """Count local TCP sockets bound to ephemeral ports, including TIME_WAIT"""
+        if not self.port_range:
+            return None
+        
+        low, high = self.port_range
+        in_use = 0
+        for path in ('/proc/net/tcp', '/proc/net/tcp6'):
+            try:
+                with open(path) as f:
+                    next(f)  # Header
+                    for line in f:
+                        port = int(line.split()[1].rsplit(':', 1)[1], 16)
+                        if low <= port <= high:
+                            in_use += 1
+            except (OSError, ValueError, IndexError, StopIteration):
+                continue
+        return in_use
+    
+    @staticmethod
+    def combine(summaries: Dict[str, Dict], target_rps: float, achieved_rps: float,
+                tolerance: float, failed_workers: Dict[str, str] = None) -> Dict:
+        """Combine per-worker health summaries into one report for the whole run"""
+        failed_workers = failed_workers or {}
+        deficit = (1 - achieved_rps / target_rps) * 100 if target_rps > 0 else 0
+        
+        def worst(key, pick=max):
+            values = [s[key] for s in summaries.values() if s.get(key) is not None]
+            return pick(values) if values else None
+        
+        warnings = [f"{worker}: {warning}" for worker, summary in summaries.items()
+                    for warning in summary['warnings']]
+        saturated = any(s.get('generator_saturated') for s in summaries.values())
+        # A shortfall or a worker that never finished invalidates the run; saturation only diagnoses the cause
+        valid = deficit <= tolerance and not failed_workers
+        backend_limited = deficit > tolerance and not saturated and achieved_rps > 0
+        for worker, error in failed_workers.items():
+            warnings.insert(0, f"{worker}: did not finish its share of the load ({error})")
+        if deficit > tolerance:
+            cause = ('a generator is saturated' if saturated else
+                     'the backend is slow (closed-loop users wait on responses)' if backend_limited else
+                     'no requests completed')
+            warnings.insert(0, f"Achieved {achieved_rps:.1f} RPS, {deficit:.1f}% below the {target_rps:.1f} RPS target; {cause}")
+        
+        return {
+            'valid': valid,
+            'backend_limited': backend_limited,
+            'generator_saturated': saturated,
+            'target_rps': target_rps,
+            'achieved_rps': achieved_rps,
+            'rate_deficit_percent': deficit,
+            'rate_tolerance_percent': tolerance,
+            'schedule_lag_p50': worst('schedule_lag_p50'),
+            'schedule_lag_p99': worst('schedule_lag_p99'),
+            'schedule_lag_max': worst('schedule_lag_max'),
+            'cpu_percent_average': worst('cpu_percent_average'),
+            'cpu_percent_peak': worst('cpu_percent_peak'),
+            'cpu_headroom_percent': worst('cpu_headroom_percent', min),
+            'ephemeral_ports_peak': worst('ephemeral_ports_peak'),
+            'ephemeral_port_headroom_percent': worst('ephemeral_port_headroom_percent', min),
+            'socket_errors': sum(s['socket_errors'] for s in summaries.values()),
+            'warnings': warnings,
+            'workers': summaries,
+            'failed_workers': failed_workers
+        }
+    
+    def summarize(self, target_rps: float, achieved_rps: float, tolerance: float) -> Dict:
+        """Report generator headroom and whether the run achieved its target arrival rate"""
+        deficit = (1 - achieved_rps / target_rps) * 100 if target_rps > 0 else 0
+        peak_cpu = max(self.cpu_samples) if self.cpu_samples else None
+        peak_ports = max(self.port_samples) if self.port_samples else None
+        port_capacity = self.port_range[1] - self.port_range[0] + 1 if self.port_range else None
+        
+        warnings = []
+        if peak_cpu is not None and peak_cpu >= 90:
+            warnings.append(f"Generator CPU peaked at {peak_cpu:.0f}% of one core")
+        if self.schedule_lag.percentile(99) > 0.1:
+            warnings.append(f"p99 send-schedule lag was {self.schedule_lag.percentile(99) * 1000:.0f} ms")
+        if self.socket_errors:
+            warnings.append(f"{self.socket_errors} requests failed from socket or port exhaustion")
+        if peak_ports is not None and port_capacity and peak_ports > port_capacity * 0.8:
+            warnings.append(f"{peak_ports} of {port_capacity} ephemeral ports in use")
+        
+        # Each warning above is a generator-side saturation signal
+        saturated = bool(warnings)
+        # A shortfall always invalidates the run; saturation signals only diagnose its cause
+        valid = deficit <= tolerance
+        backend_limited = not valid and not saturated and achieved_rps > 0
+        if deficit > tolerance:
+            cause = ('the generator is saturated' if saturated else
+                     'the backend is slow (closed-loop users wait on responses)' if backend_limited else
+                     'no requests completed')
+            warnings.insert(0, f"Achieved {achieved_rps:.1f} RPS, {deficit:.1f}% below the {target_rps:.1f} RPS target; {cause}")
+        
+        return {
+            'valid': valid,
+            'backend_limited': backend_limited,
+            'generator_saturated': saturated,
+            'target_rps': target_rps,
+            'achieved_rps': achieved_rps,
+            'rate_deficit_percent': deficit,
+            'rate_tolerance_percent': tolerance,
+            'schedule_lag_p50': self.schedule_lag.percentile(50),
+            'schedule_lag_p99': self.schedule_lag.percentile(99),
+            'schedule_lag_max': self.schedule_lag.max or 0.0,
+            'cpu_percent_average': statistics.mean(self.cpu_samples) if self.cpu_samples else None,
+            'cpu_percent_peak': peak_cpu,
+            'cpu_headroom_percent': max(0.0, 100 - peak_cpu) if peak_cpu is not None else None,
+            'ephemeral_ports_peak': peak_ports,
+            'ephemeral_port_headroom_percent': (
+                (1 - peak_ports / port_capacity) * 100 if peak_ports is not None and port_capacity else None
+            ),
+            'socket_errors': self.socket_errors,
+            'warnings': warnings
+        }
+
+class LoadGenerator:
+    """Paced HTTP load generator that records per-backend stats and its own health"""
+    
+    def __init__(self, url: str, rate_tolerance: float = 10.0):
+        self.url = url
+        self.rate_tolerance = rate_tolerance
+        self.active = False
+    
+    def worker(self, duration: int, requests_per_second: int, stats: LoadStats,
+               health: GeneratorHealthMonitor = None) -> Dict:
+        """Worker function for load testing"""
+        if not self.url:
+            logger.error("ALB DNS not available for load testing")
+            return {'success': 0, 'failed': 0}
+        
+        url = self.url
+        interval = 1.0 / requests_per_second if requests_per_second > 0 else 1.0
+        
+        success_count = 0
+        failed_count = 0
+        
+        end_time = time.time() + duration
+        
+        while time.time() < end_time and self.active:
+            backend = 'unknown'
+            try:
+                start_time = time.time()
+                response = requests.get(url, timeout=10)
+                response_time = time.time() - start_time
+                
+                # Instances tag responses with their ID (see user-data/webserver-setup.sh)
+                backend = response.headers.get('X-Instance-Id', 'unknown')
+                success = response.status_code == 200
+                    
+            except Exception as e:
+                response_time = time.time() - start_time
+                success = False
+                if health:
+                    health.record_error(e)
+                logger.debug(f"Request failed: {str(e)}")
+            
+            stats.record(start_time, backend, response_time, success)
+            if success:
+                success_count += 1
+            else:
+                failed_count += 1
+            
+            # Control request rate; only oversleeping counts as lag, a slow backend is not the generator's fault
+            intended_time = start_time + interval
+            delay = intended_time - time.time()
+            if delay > 0:
+                time.sleep(delay)
+                if health:
+                    health.record_send(intended_time, time.time())
+        
+        return {
+            'success': success_count,
+            'failed': failed_count
+        }
+    
+    def run(self, duration: int, concurrent_users: int, requests_per_second: int = 1,
+            stats: LoadStats = None) -> LoadStats:
+        """Run load worker threads and collect per-backend statistics"""
+        logger.info(f"Starting load test: {concurrent_users} users, {requests_per_second} RPS each, {duration}s duration")
+        
+        stats = stats or LoadStats()
+        health = GeneratorHealthMonitor()
+        self.active = True
+        health.start()
+        run_start = time.time()
+        
+        # Start load testing threads
+        total_requests = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrent_users) as executor:
+            futures = []
+            
+            for _ in range(concurrent_users):
+                future = executor.submit(self.worker, duration, requests_per_second, stats, health)
+                futures.append(future)
+            
+            # Wait for all threads to complete
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    result = future.result()
+                    total_requests += result['success'] + result['failed']
+                except Exception as e:
+                    logger.error(f"Load test worker failed: {str(e)}")
+        
+        elapsed = time.time() - run_start
+        self.active = False
+        health.stop()
+        
+        # Judge the generator against the arrival rate it was asked to produce, over the time it actually ran
+        achieved_rps = total_requests / elapsed if elapsed > 0 else 0
+        stats.generator_health = health.summarize(
+            concurrent_users * requests_per_second, achieved_rps, self.rate_tolerance
+        )
+        return stats
+    
+    def stop(self):
+        self.active = False
+
+class LoadWorkerHandler(socketserver.StreamRequestHandler):
+    """Runs one load profile for a coordinator and streams per-second results back"""
+    
+    def handle(self):
+        message = json.loads(self.rfile.readline() or 'null')
+        if not message or message.get('type') != 'start':
+            return
+        
+        # Only accept profiles from coordinators holding the shared token, aimed at the pinned target
+        if not hmac.compare_digest(str(message.get('token', '')), self.server.token):
+            logger.warning(f"Rejected load request from {self.client_address[0]}: bad token")
+            self._send({'type': 'error', 'message': 'invalid worker token'})
+            return
+        if self.server.target_url and message['url'] != self.server.target_url:
+            logger.warning(f"Rejected load request from {self.client_address[0]} for {message['url']}")
+            self._send({'type': 'error', 'message': f"worker only generates load against {self.server.target_url}"})
+            return
+        
+        generator = LoadGenerator(message['url'], message['rate_tolerance'])
+        stats = LoadStats(start_time=message['start_at'])
+        self.stopped = threading.Event()
+        threading.Thread(target=self._wait_for_stop, args=(generator,), daemon=True).start()
+        
+        logger.info(f"Coordinator {self.client_address[0]} scheduled load in "
+                    f"{message['start_at'] - time.time():.1f}s")
+        if self.stopped.wait(max(0, message['start_at'] - time.time())):
+            logger.info(f"Coordinator {self.client_address[0]} cancelled the load before it started")
+            return
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(generator.run, message['duration'], message['concurrent_users'],
+                                     message['requests_per_second'], stats)
+            
+            # Stream each second once it is complete
+            while not future.done():
+                concurrent.futures.wait([future], timeout=1)
+                self._send_seconds(stats.drain(int(time.time() - stats.start_time)))
+            future.result()
+        
+        self._send_seconds(stats.drain())
+        self._send({'type': 'done', 'generator_health': stats.generator_health})
+    
+    def _wait_for_stop(self, generator: LoadGenerator):
+        """Stop the local load when the coordinator says so or disconnects"""
+        try:
+            for line in self.rfile:
+                if json.loads(line).get('type') == 'stop':
+                    break
+        except (OSError, ValueError):
+            pass
+        self.stopped.set()
+        generator.stop()
+    
+    def _send_seconds(self, seconds: Dict[int, Dict]):
+        for second, backends in seconds.items():
+            self._send({
+                'type': 'second',
+                'second': second,
+                'backends': {
+                    backend: {'success': bucket['success'], 'failed': bucket['failed'],
+                              'latency': bucket['latency'].to_dict()}
+                    for backend, bucket in backends.items()
+                }
+            })
+    
+    def _send(self, message: Dict):
+        self.wfile.write((json.dumps(message) + '\n').encode('utf-8'))
+        self.wfile.flush()
+
+class LoadWorkerServer(socketserver.ThreadingTCPServer):
+    """TCP server accepting load profiles from a coordinator"""
+    
+    allow_reuse_address = True
+    daemon_threads = True
+    
+    def __init__(self, address: Tuple[str, int], token: str, target_url: str = None):
+        self.token = token
+        self.target_url = target_url
+        super().__init__(address, LoadWorkerHandler)
+
+class DistributedLoadCoordinator:
+    """Splits a load profile across remote workers and merges their per-second results"""
+    
+    START_DELAY = 2.0  # Seconds for every worker to receive the profile before it starts
+    
+    def __init__(self, workers: List[str], url: str, rate_tolerance: float = 10.0, token: str = ''):
+        self.workers = workers  # host:port strings
+        self.url = url
+        self.rate_tolerance = rate_tolerance
+        self.token = token
+        self.connections = []
+    
+    def run(self, duration: int, concurrent_users: int, requests_per_second: int = 1) -> LoadStats:
+        """Start every worker at the same moment and merge their streamed timelines"""
+        logger.info(f"Starting distributed load test on {len(self.workers)} workers: {concurrent_users} users, "
+                    f"{requests_per_second} RPS each, {duration}s duration")
+        
+        start_at = time.time() + self.START_DELAY
+        stats = LoadStats(start_time=start_at)
+        
+        # Spread users as evenly as possible; each keeps the same per-user rate
+        shares = [concurrent_users // len(self.workers)] * len(self.workers)
+        for index in range(concurrent_users % len(self.workers)):
+            shares[index] += 1
+        
+        self.connections = []
+        try:
+            for worker, users in zip(self.workers, shares):
+                if users == 0:
+                    continue
+                host, port = worker.rsplit(':', 1)
+                connection = socket.create_connection((host, int(port)), timeout=10)
+                self.connections.append((worker, connection))
+                connection.settimeout(duration + 60)
+                connection.sendall((json.dumps({
+                    'type': 'start',
+                    'token': self.token,
+                    'url': self.url,
+                    'duration': duration,
+                    'concurrent_users': users,
+                    'requests_per_second': requests_per_second,
+                    'start_at': start_at,
+                    'rate_tolerance': self.rate_tolerance
+                }) + '\n').encode('utf-8'))
+        except OSError:
+            # Cancel the workers already scheduled so none of them runs a partial load
+            logger.error(f"Could not start load worker {worker}; stopping the others")
+            self.stop()
+            for _, connection in self.connections:
+                connection.close()
+            self.connections = []
+            raise
+        
+        health = {}
+        failed = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(self.connections) or 1) as executor:
+            futures = {executor.submit(self._receive, connection, stats): worker
+                       for worker, connection in self.connections}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    health[futures[future]] = future.result()
+                except Exception as e:
+                    logger.error(f"Load worker {futures[future]} failed: {str(e)}")
+                    failed[futures[future]] = str(e)
+        
+        for _, connection in self.connections:
+            connection.close()
+        
+        achieved_rps = sum(h['achieved_rps'] for h in health.values())
+        stats.generator_health = GeneratorHealthMonitor.combine(
+            health, concurrent_users * requests_per_second, achieved_rps, self.rate_tolerance, failed
+        )
+        return stats
+    
+    def _receive(self, connection: socket.socket, stats: LoadStats) -> Dict:
+        """Merge one worker's streamed seconds until it reports its generator health"""
+        with connection.makefile('r', encoding='utf-8') as stream:
+            for line in stream:
+                message = json.loads(line)
+                if message['type'] == 'second':
+                    for backend, bucket in message['backends'].items():
+                        bucket['latency'] = LatencyHistogram.from_dict(bucket['latency'])
+                        stats.add_bucket(message['second'], backend, bucket)
+                elif message['type'] == 'done':
+                    return message['generator_health']
+                elif message['type'] == 'error':
+                    raise ConnectionError(f"worker refused the load: {message['message']}")
+        raise ConnectionError('worker disconnected before finishing')
+    
+    def stop(self):
+        """Ask every worker to stop its load early"""
+        for worker, connection in self.connections:
+            try:
+                connection.sendall(b'{"type": "stop"}\n')
+            except OSError as e:
+                logger.debug(f"Could not stop worker {worker}: {str(e)}")
+
+# Repository paths for the policy and alarm configurations under test
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+POLICY_FILES = {
+    'target-tracking': ['scripts/scaling-policies/target-tracking-policy.json'],
+    'step': ['scripts/scaling-policies/step-scaling-policy.json', 'configurations/cloudwatch-alarms.json']
+}
+
+def load_policy_config(spec: str) -> Dict:
+    """Load a policy by name ('target-tracking', 'step') or as name=path to a policy JSON file"""
+    if '=' in spec:
+        name, path = spec.split('=', 1)
+        paths = [path]
+    else:
+        name = spec
+        paths = [os.path.join(REPO_ROOT, path) for path in POLICY_FILES[spec]]
+    
+    config = {}
+    for path in paths:
+        with open(path) as f:
+            config.update(json.load(f))
+    
+    # Step policies without their own alarms use the repository's CPU alarms
+    if 'ScaleUpPolicy' in config and 'CloudWatchAlarms' not in config:
+        with open(os.path.join(REPO_ROOT, 'configurations', 'cloudwatch-alarms.json')) as f:
+            config.update(json.load(f))
+    
+    return {'name': name, 'config': config}
+
+def load_load_profile(path: str = None) -> List[float]:
+    """Build a per-second target RPS profile from a steps file or a recorded test report"""
+    if not path:
+        # Default morning ramp: quiet, 10 minute ramp to peak, hold, then wind down
+        steps = [{'duration': 600, 'rps': 150}]
+        steps += [{'duration': 60, 'rps': 150 + 75 * i} for i in range(1, 11)]
+        steps += [{'duration': 1200, 'rps': 900}]
+        steps += [{'duration': 60, 'rps': 900 - 75 * i} for i in range(1, 11)]
+        steps += [{'duration': 1200, 'rps': 150}]
+    else:
+        with open(path) as f:
+            data = json.load(f)
+        steps = data.get('steps') or _recorded_steps(data)
+    
+    profile = []
+    for step in steps:
+        profile.extend([float(step['rps'])] * int(step['duration']))
+    return profile
+
+def _recorded_steps(report: Dict) -> List[Dict]:
+    """Turn the backend timelines of a previous scaling-test report into load steps"""
+    steps = []
+    for result in report.get('test_results', []):
+        phases = [result.get('load_test_results')] + list(result.get('load_phases', {}).values())
+        for phase in phases:
+            timeline = (phase or {}).get('backend_timeline', [])
+            offsets = [window['offset_seconds'] for window in timeline]
+            
+            for index, window in enumerate(timeline):
+                if index + 1 < len(offsets):
+                    duration = offsets[index + 1] - offsets[index]
+                elif index:
+                    duration = offsets[index] - offsets[index - 1]
+                else:
+                    duration = 10
+                
+                rps = sum(b['requests_per_second'] for b in window['backends'].values())
+                steps.append({'duration': duration, 'rps': rps})
+    return steps
+
+class TargetTrackingPolicy:
+    """Simulated target tracking on ASG average CPU, evaluated on 1-minute datapoints"""
+    
+    SCALE_OUT_DATAPOINTS = 3
+    SCALE_IN_DATAPOINTS = 15
+    
+    def __init__(self, config: Dict):
+        self.target = config['TargetValue']
+        self.scale_out_cooldown = config.get('ScaleOutCooldown', 300)
+        self.scale_in_cooldown = config.get('ScaleInCooldown', 300)
+        self.disable_scale_in = config.get('DisableScaleIn', False)
+        self.next_scale_out = 0
+        self.next_scale_in = 0
+    
+    def evaluate(self, now: int, cpu_minutes: List[float], in_service: int, desired: int) -> int:
+        """Get the new desired capacity after the latest CPU datapoint"""
+        recent = cpu_minutes[-self.SCALE_OUT_DATAPOINTS:]
+        if (len(recent) == self.SCALE_OUT_DATAPOINTS and min(recent) > self.target
+                and now >= self.next_scale_out):
+            wanted = math.ceil(in_service * statistics.mean(recent) / self.target)
+            if wanted > desired:
+                self.next_scale_out = now + self.scale_out_cooldown
+                self.next_scale_in = now + self.scale_in_cooldown
+                return wanted
+        
+        recent = cpu_minutes[-self.SCALE_IN_DATAPOINTS:]
+        if (not self.disable_scale_in and len(recent) == self.SCALE_IN_DATAPOINTS
+                and max(recent) < self.target * 0.9 and now >= self.next_scale_in):
+            wanted = math.ceil(in_service * statistics.mean(recent) / self.target)
+            if wanted < desired:
+                self.next_scale_in = now + self.scale_in_cooldown
+                return wanted
+        
+        return desired
+
+class StepScalingPolicy:
+    """Simulated step scaling driven by the CPU high/low CloudWatch alarms"""
+    
+    def __init__(self, config: Dict):
+        alarms = config['CloudWatchAlarms']
+        self.high = next(a for a in alarms if a['ComparisonOperator'].startswith('Greater'))
+        self.low = next(a for a in alarms if a['ComparisonOperator'].startswith('Less'))
+        self.scale_up = config['ScaleUpPolicy']
+        self.scale_down = config['ScaleDownPolicy']
+        self.next_action = 0
+    
+    @staticmethod
+    def _breaching(alarm: Dict, cpu_minutes: List[float]) -> float:
+        """Get the latest period average if every evaluation period breaches, else None"""
+        period = max(1, alarm['Period'] // 60)
+        needed = period * alarm['EvaluationPeriods']
+        if len(cpu_minutes) < needed:
+            return None
+        
+        window = cpu_minutes[-needed:]
+        averages = [statistics.mean(window[i:i + period]) for i in range(0, needed, period)]
+        if alarm['ComparisonOperator'].startswith('Greater'):
+            breached = all(avg > alarm['Threshold'] for avg in averages)
+        else:
+            breached = all(avg < alarm['Threshold'] for avg in averages)
+        return averages[-1] if breached else None
+    
+    @staticmethod
+    def _adjustment(policy: Dict, breach: float) -> int:
+        """Pick the step adjustment for how far the metric is past the alarm threshold"""
+        for step in policy['StepAdjustments']:
+            lower = step.get('MetricIntervalLowerBound', float('-inf'))
+            upper = step.get('MetricIntervalUpperBound', float('inf'))
+            if lower <= breach < upper:
+                return step['ScalingAdjustment']
+        return 0
+    
+    def evaluate(self, now: int, cpu_minutes: List[float], in_service: int, desired: int) -> int:
+        """Get the new desired capacity after the latest CPU datapoint"""
+        if now < self.next_action:
+            return desired
+        
+        for alarm, policy in ((self.high, self.scale_up), (self.low, self.scale_down)):
+            value = self._breaching(alarm, cpu_minutes)
+            if value is not None:
+                adjustment = self._adjustment(policy, value - alarm['Threshold'])
+                if adjustment:
+                    self.next_action = now + policy.get('Cooldown', 300)
+                    return desired + adjustment
+        
+        return desired
+
+class ScalingSimulator:
+    """Second-by-second model of the ASG fleet, its scaling policy and request latency"""
+    
+    def __init__(self, min_size: int, max_size: int, desired: int, instance_capacity_rps: float = 225,
+                 boot_seconds: int = 240, service_time: float = 0.04, timeout: float = 10.0):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.desired = desired
+        self.instance_capacity_rps = instance_capacity_rps  # RPS at 100% CPU per instance
+        self.boot_seconds = boot_seconds  # Launch to serving traffic
+        self.service_time = service_time  # Mean latency of an idle instance
+        self.timeout = timeout
+    
+    def run(self, profile: List[float], policy) -> List[Dict]:
+        """Replay a per-second RPS profile and record fleet size, load served and p99 latency"""
+        ready_at = [0] * self.desired  # Second at which each instance starts serving
+        cpu_minutes = []
+        minute_cpu = []
+        records = []
+        
+        for second, load in enumerate(profile):
+            in_service = sum(1 for t in ready_at if t <= second)
+            capacity = in_service * self.instance_capacity_rps
+            utilization = load / capacity if capacity else float('inf')
+            
+            if utilization < 1:
+                served, failed = load, 0.0
+                # M/M/1 response time tail: p99 = mean * ln(100)
+                p99 = min(self.timeout, self.service_time / (1 - utilization) * math.log(100))
+            else:
+                served, failed = capacity, load - capacity
+                p99 = self.timeout
+            
+            minute_cpu.append(min(100.0, utilization * 100))
+            records.append({
+                'second': second,
+                'load': load,
+                'served': served,
+                'failed': failed,
+                'p99': p99,
+                'in_service': in_service,
+                'running': len(ready_at)
+            })
+            
+            # Policies act on 1-minute CPU datapoints
+            if len(minute_cpu) == 60:
+                cpu_minutes.append(statistics.mean(minute_cpu))
+                minute_cpu = []
+                
+                desired = policy.evaluate(second, cpu_minutes, in_service, len(ready_at))
+                desired = max(self.min_size, min(self.max_size, desired))
+                while len(ready_at) < desired:
+                    ready_at.append(second + self.boot_seconds)
+                while len(ready_at) > desired:
+                    ready_at.remove(max(ready_at))  # Terminate the newest instance first
+        
+        return records
+
 class AutoScalingTester:
     """Tests auto-scaling behavior by generating load and monitoring responses"""
     
-    def __init__(self, region='us-east-1', asg_name='XYZ-Corp-AutoScaling-Group', alb_dns=None):
+    def __init__(self, region='us-east-1', asg_name='XYZ-Corp-AutoScaling-Group', alb_dns=None,
+                 metrics_cache_ttl=60, timeline_window=10, rate_tolerance=10.0, remote_workers=None,
+                 worker_token=None):
         self.region = region
         self.asg_name = asg_name
         self.alb_dns = alb_dns
+        self.alb_arn = None
+        self.target_group_arn = None
         
         # AWS clients
         self.autoscaling = boto3.client('autoscaling', region_name=region)
         self.cloudwatch = boto3.client('cloudwatch', region_name=region)
         self.elbv2 = boto3.client('elbv2', region_name=region)
+        self.ec2 = boto3.client('ec2', region_name=region)
         
         # Test configuration
         self.test_results = []
-        self.load_test_active = False
+        self.load_generator = None
+        self.remote_workers = remote_workers or []
+        self.worker_token = worker_token or ''
+        self.timeline_window = timeline_window
+        self.rate_tolerance = rate_tolerance
         
         # Discover ALB DNS if not provided
         if not self.alb_dns:
             self.alb_dns = self._discover_alb_dns()
+        
+        # Batched CloudWatch queries for ASG, ALB and custom metrics
+        target_group_arn = self._discover_target_group_arn()
+        self.metrics = MetricsQuery(
+            self.cloudwatch,
+            self.asg_name,
+            load_balancer=self._arn_suffix(self.alb_arn, ':loadbalancer/'),
+            target_group=self._arn_suffix(target_group_arn, ':'),
+            cache_ttl=metrics_cache_ttl
+        )
     
     def _discover_alb_dns(self) -> str:
         """Discover ALB DNS name automatically"""
         try:
             response = self.elbv2.describe_load_balancers(Names=['XYZ-Corp-LoadBalancer'])
+            self.alb_arn = response['LoadBalancers'][0]['LoadBalancerArn']
             return response['LoadBalancers'][0]['DNSName']
         except Exception as e:
             logger.error(f"Could not discover ALB DNS: {str(e)}")
             return None
     
+    def _discover_target_group_arn(self) -> str:
+        """Discover the ALB target group used by the ASG"""
+        try:
+            if not self.alb_arn:
+                response = self.elbv2.describe_load_balancers(Names=['XYZ-Corp-LoadBalancer'])
+                self.alb_arn = response['LoadBalancers'][0]['LoadBalancerArn']
+            
+            response = self.elbv2.describe_target_groups(LoadBalancerArn=self.alb_arn)
+            self.target_group_arn = response['TargetGroups'][0]['TargetGroupArn']
+            return self.target_group_arn
+        except Exception as e:
+            logger.warning(f"Could not discover target group, ALB metrics disabled: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _arn_suffix(arn: str, separator: str) -> str:
+        """Get the CloudWatch dimension value from an ELB ARN"""
+        if not arn:
+            return None
+        if separator == ':':
+            return arn.rsplit(':', 1)[-1]
+        return arn.split(separator, 1)[-1]
+    
     def get_current_capacity(self) -> Dict:
         """Get current Auto Scaling Group capacity"""
         try:
@@ -81,6 +1075,19 @@ class AutoScalingTester:
             logger.error(f"Error getting ASG capacity: {str(e)}")
             return {}
     
+    def get_asg_instances(self) -> List[Dict]:
+        """Get the instances currently in the Auto Scaling Group"""
+        try:
+            response = self.autoscaling.describe_auto_scaling_groups(
+                AutoScalingGroupNames=[self.asg_name]
+            )
+            if not response['AutoScalingGroups']:
+                return []
+            return response['AutoScalingGroups'][0]['Instances']
+        except Exception as e:
+            logger.error(f"Error getting ASG instances: {str(e)}")
+            return []
+    
     def get_scaling_activities(self, max_records=10) -> List[Dict]:
         """Get recent scaling activities"""
         try:
@@ -93,120 +1100,113 @@ class AutoScalingTester:
             logger.error(f"Error getting scaling activities: {str(e)}")
             return []
     
-    def get_cpu_utilization(self, minutes=10) -> float:
-        """Get average CPU utilization for the ASG"""
+    def get_metric_series(self, start_time: datetime, end_time: datetime = None) -> Dict[str, Dict]:
+        """Get 1-minute series for CPU, ALB and custom metrics in one batched query"""
         try:
-            end_time = datetime.utcnow()
-            start_time = end_time - timedelta(minutes=minutes)
-            
-            response = self.cloudwatch.get_metric_statistics(
-                Namespace='AWS/AutoScaling',
-                MetricName='CPUUtilization',
-                Dimensions=[
-                    {
-                        'Name': 'AutoScalingGroupName',
-                        'Value': self.asg_name
-                    }
-                ],
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=300,  # 5 minutes
-                Statistics=['Average']
-            )
-            
-            if response['Datapoints']:
-                return statistics.mean([dp['Average'] for dp in response['Datapoints']])
-            return 0.0
-            
+            return self.metrics.fetch(start_time, end_time)
         except Exception as e:
-            logger.error(f"Error getting CPU utilization: {str(e)}")
-            return 0.0
+            logger.error(f"Error getting metric series: {str(e)}")
+            return {}
     
-    def load_test_worker(self, duration: int, requests_per_second: int) -> Dict:
-        """Worker function for load testing"""
-        if not self.alb_dns:
-            logger.error("ALB DNS not available for load testing")
-            return {'success': 0, 'failed': 0, 'response_times': []}
+    def get_cpu_utilization(self, minutes=10) -> float:
+        """Get average CPU utilization for the ASG"""
+        series = self.get_metric_series(datetime.utcnow() - timedelta(minutes=minutes))
+        values = series.get('CPUUtilization', {}).get('values', [])
         
-        url = f"http://{self.alb_dns}/"
-        interval = 1.0 / requests_per_second if requests_per_second > 0 else 1.0
+        if values:
+            return statistics.mean(values)
+        return 0.0
+    
+    def run_load(self, duration: int, concurrent_users: int, requests_per_second: int = 1) -> LoadStats:
+        """Run load locally or across remote workers and collect per-backend statistics"""
+        url = f"http://{self.alb_dns}/" if self.alb_dns else None
         
-        success_count = 0
-        failed_count = 0
-        response_times = []
+        if self.remote_workers:
+            self.load_generator = DistributedLoadCoordinator(
+                self.remote_workers, url, self.rate_tolerance, self.worker_token
+            )
+        else:
+            self.load_generator = LoadGenerator(url, self.rate_tolerance)
         
-        end_time = time.time() + duration
+        stats = self.load_generator.run(duration, concurrent_users, requests_per_second)
         
-        while time.time() < end_time and self.load_test_active:
-            try:
-                start_time = time.time()
-                response = requests.get(url, timeout=10)
-                response_time = time.time() - start_time
-                
-                if response.status_code == 200:
-                    success_count += 1
-                    response_times.append(response_time)
-                else:
-                    failed_count += 1
-                    
-            except Exception as e:
-                failed_count += 1
-                logger.debug(f"Request failed: {str(e)}")
-            
-            # Control request rate
-            time.sleep(max(0, interval - (time.time() - start_time)))
+        for warning in stats.generator_health['warnings']:
+            logger.warning(f"Load generator: {warning}")
+        if not stats.generator_health['valid']:
+            reason = ('a load worker did not finish' if stats.generator_health.get('failed_workers') else
+                      'the backend could not keep up' if stats.generator_health['backend_limited'] else
+                      'the target rate was not sustained')
+            logger.warning(f"Load test results are INVALID: {reason}")
         
-        return {
-            'success': success_count,
-            'failed': failed_count,
-            'response_times': response_times
-        }
+        return stats
+    
+    def stop_load(self):
+        """Stop any load test in progress"""
+        if self.load_generator:
+            self.load_generator.stop()
     
     def generate_load(self, duration: int, concurrent_users: int, requests_per_second: int = 1) -> Dict:
         """Generate load using multiple threads"""
-        logger.info(f"Starting load test: {concurrent_users} users, {requests_per_second} RPS each, {duration}s duration")
-        
-        self.load_test_active = True
-        
-        # Start load testing threads
-        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrent_users) as executor:
-            futures = []
-            
-            for _ in range(concurrent_users):
-                future = executor.submit(self.load_test_worker, duration, requests_per_second)
-                futures.append(future)
-            
-            # Wait for all threads to complete
-            results = []
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    logger.error(f"Load test worker failed: {str(e)}")
-        
-        self.load_test_active = False
-        
-        # Aggregate results
-        total_success = sum(r['success'] for r in results)
-        total_failed = sum(r['failed'] for r in results)
-        all_response_times = []
-        for r in results:
-            all_response_times.extend(r['response_times'])
-        
-        avg_response_time = statistics.mean(all_response_times) if all_response_times else 0
-        p95_response_time = statistics.quantiles(all_response_times, n=20)[18] if len(all_response_times) > 20 else 0
+        stats = self.run_load(duration, concurrent_users, requests_per_second)
+        return self.summarize_load(stats, duration)
+    
+    def summarize_load(self, stats: LoadStats, duration: int) -> Dict:
+        """Summarize a load test overall, per backend and over time"""
+        totals = stats.totals()
+        total_success = totals['success']
+        total_failed = totals['failed']
+        latency = totals['latency']
         
         return {
             'total_requests': total_success + total_failed,
             'successful_requests': total_success,
             'failed_requests': total_failed,
             'success_rate': (total_success / (total_success + total_failed) * 100) if (total_success + total_failed) > 0 else 0,
-            'average_response_time': avg_response_time,
-            'p95_response_time': p95_response_time,
-            'requests_per_second': (total_success + total_failed) / duration if duration > 0 else 0
+            'average_response_time': latency.mean(),
+            'p95_response_time': latency.percentile(95),
+            'p99_response_time': latency.percentile(99),
+            'requests_per_second': (total_success + total_failed) / duration if duration > 0 else 0,
+            'generator_health': stats.generator_health,
+            'valid': stats.generator_health['valid'] if stats.generator_health else True,
+            'backend_distribution': self._summarize_backends(stats.by_backend(), duration),
+            'backend_timeline': self._summarize_backend_timeline(stats)
         }
     
+    def _summarize_backends(self, backends: Dict[str, Dict], duration: int) -> Dict[str, Dict]:
+        """Summarize RPS share and latency percentiles for each backend instance"""
+        total_requests = sum(b['success'] + b['failed'] for b in backends.values())
+        
+        summary = {}
+        for backend, bucket in sorted(backends.items()):
+            requests_served = bucket['success'] + bucket['failed']
+            summary[backend] = {
+                'requests': requests_served,
+                'failed_requests': bucket['failed'],
+                'requests_per_second': requests_served / duration if duration > 0 else 0,
+                'rps_share': (requests_served / total_requests * 100) if total_requests else 0,
+                'average_response_time': bucket['latency'].mean(),
+                'p50_response_time': bucket['latency'].percentile(50),
+                'p95_response_time': bucket['latency'].percentile(95),
+                'p99_response_time': bucket['latency'].percentile(99)
+            }
+        return summary
+    
+    def _summarize_backend_timeline(self, stats: LoadStats) -> List[Dict]:
+        """Summarize per-backend share and percentiles in fixed windows over the run"""
+        if not stats.timeline:
+            return []
+        
+        window = self.timeline_window
+        timeline = []
+        for first_second in range(0, max(stats.timeline) + 1, window):
+            backends = stats.by_backend(first_second, first_second + window - 1)
+            if backends:
+                timeline.append({
+                    'offset_seconds': first_second,
+                    'backends': self._summarize_backends(backends, window)
+                })
+        return timeline
+    
     def monitor_scaling_event(self, timeout: int = 600) -> Dict:
         """Monitor for scaling events during test"""
         logger.info(f"Monitoring scaling events for {timeout} seconds...")
@@ -251,6 +1251,7 @@ class AutoScalingTester:
         logger.info("=" * 50)
         
         # Get baseline metrics
+        test_start = datetime.utcnow()
         initial_capacity = self.get_current_capacity()
         initial_cpu = self.get_cpu_utilization(5)
         
@@ -293,6 +1294,7 @@ class AutoScalingTester:
             },
             'load_test_results': load_results,
             'monitoring_results': monitoring_results,
+            'metric_series': self.get_metric_series(test_start),
             'scaling_activities': recent_activities,
             'success': monitoring_results['scaling_detected'] and monitoring_results['capacity_change'] > 0
         }
@@ -305,6 +1307,7 @@ class AutoScalingTester:
         logger.info("=" * 50)
         
         # Get baseline metrics
+        test_start = datetime.utcnow()
         initial_capacity = self.get_current_capacity()
         initial_cpu = self.get_cpu_utilization(5)
         
@@ -335,6 +1338,7 @@ class AutoScalingTester:
                 'cpu_utilization': final_cpu
             },
             'monitoring_results': monitoring_results,
+            'metric_series': self.get_metric_series(test_start),
             'scaling_activities': recent_activities,
             'success': monitoring_results['scaling_detected'] and monitoring_results['capacity_change'] < 0
         }
@@ -347,6 +1351,7 @@ class AutoScalingTester:
         logger.info("=" * 50)
         
         # Get baseline
+        test_start = datetime.utcnow()
         initial_capacity = self.get_current_capacity()
         
         # Start monitoring
@@ -395,12 +1400,575 @@ class AutoScalingTester:
                 'heavy_load': heavy_load_results
             },
             'monitoring_results': monitoring_results,
+            'metric_series': self.get_metric_series(test_start),
             'scaling_activities': recent_activities,
             'max_capacity_reached': max(activity.get('DesiredCapacity', 0) for activity in recent_activities if 'DesiredCapacity' in activity)
         }
         
         return test_results
     
+    def track_instance_lifecycle(self, known_instances: set, stop_event: threading.Event,
+                                 poll_interval: int = 5) -> Dict[str, Dict]:
+        """Record when each newly launched instance goes InService and passes its first health check"""
+        lifecycle = {}
+        
+        while not stop_event.is_set():
+            now = time.time()
+            
+            for instance in self.get_asg_instances():
+                instance_id = instance['InstanceId']
+                if instance_id in known_instances:
+                    continue
+                
+                events = lifecycle.setdefault(instance_id, {'first_seen': now})
+                if instance['LifecycleState'] == 'InService' and 'in_service' not in events:
+                    events['in_service'] = now
+            
+            if lifecycle:
+                for instance_id in self.get_healthy_targets():
+                    if instance_id in lifecycle:
+                        lifecycle[instance_id].setdefault('healthy', now)
+            
+            stop_event.wait(poll_interval)
+        
+        # EC2 launch time is more precise than our first poll
+        if lifecycle:
+            try:
+                response = self.ec2.describe_instances(InstanceIds=list(lifecycle))
+                for reservation in response['Reservations']:
+                    for instance in reservation['Instances']:
+                        lifecycle[instance['InstanceId']]['launched'] = instance['LaunchTime'].timestamp()
+            except Exception as e:
+                logger.error(f"Error getting instance launch times: {str(e)}")
+        
+        return lifecycle
+    
+    def get_healthy_targets(self) -> set:
+        """Get the IDs of instances passing target group health checks"""
+        if not self.target_group_arn:
+            return set()
+        
+        try:
+            response = self.elbv2.describe_target_health(TargetGroupArn=self.target_group_arn)
+            return {d['Target']['Id'] for d in response['TargetHealthDescriptions']
+                    if d['TargetHealth']['State'] == 'healthy'}
+        except Exception as e:
+            logger.error(f"Error getting target health: {str(e)}")
+            return set()
+    
+    def _first_fast_response(self, stats: LoadStats, backend: str, threshold: float) -> float:
+        """Get the first time a backend answered faster than the latency threshold"""
+        for second in sorted(stats.timeline):
+            bucket = stats.timeline[second].get(backend)
+            if bucket and bucket['latency'].min is not None and bucket['latency'].min <= threshold:
+                return stats.start_time + second
+        return None
+    
+    def _run_cold_start_once(self, instances: int, timeout: int, warmup: int,
+                             poll_interval: int) -> Dict:
+        """Launch instances under steady load and time each startup stage"""
+        capacity = self.get_current_capacity()
+        if not capacity:
+            return {'error': 'Auto Scaling Group not available'}
+        if capacity['desired'] + instances > capacity['max']:
+            return {'error': f"Cannot launch {instances} instances above MaxSize {capacity['max']}"}
+        
+        known_instances = {i['InstanceId'] for i in self.get_asg_instances()}
+        stop_event = threading.Event()
+        
+        scaled_out = False
+        suspended_alarms = []
+        try:
+            # The ASG's own policies would scale in (or out) while we hold the raised capacity
+            suspended_alarms = self._suspend_existing_policies()
+            
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                # Steady background load gives new instances traffic as soon as they are healthy
+                load_future = executor.submit(self.run_load, timeout + warmup, 10, 2)
+                try:
+                    time.sleep(warmup)
+                    
+                    scale_out_time = time.time()
+                    logger.info(f"Setting desired capacity to {capacity['desired'] + instances}")
+                    scaled_out = True
+                    self.autoscaling.set_desired_capacity(
+                        AutoScalingGroupName=self.asg_name,
+                        DesiredCapacity=capacity['desired'] + instances,
+                        HonorCooldown=False
+                    )
+                    
+                    tracker_future = executor.submit(
+                        self.track_instance_lifecycle, known_instances, stop_event, poll_interval
+                    )
+                    
+                    # Wait for every new instance to pass health checks, then let traffic reach it
+                    deadline = scale_out_time + timeout
+                    while time.time() < deadline:
+                        if len(self.get_healthy_targets() - known_instances) >= instances:
+                            break
+                        time.sleep(poll_interval)
+                    time.sleep(min(60, max(0, deadline - time.time())))
+                finally:
+                    # Always release the load and tracker threads so the executor can shut down
+                    self.stop_load()
+                    stop_event.set()
+                
+                stats = load_future.result()
+                lifecycle = tracker_future.result()
+        finally:
+            # Restore the original capacity and policies even if the run failed or was interrupted
+            try:
+                if scaled_out:
+                    self.autoscaling.set_desired_capacity(
+                        AutoScalingGroupName=self.asg_name,
+                        DesiredCapacity=capacity['desired'],
+                        HonorCooldown=False
+                    )
+            finally:
+                self._resume_existing_policies(suspended_alarms)
+        
+        baseline = LatencyHistogram()
+        for backend, bucket in stats.by_backend(0, warmup - 1).items():
+            if backend in known_instances:
+                baseline.merge(bucket['latency'])
+        threshold = baseline.percentile(95)
+        
+        results = {}
+        for instance_id, events in lifecycle.items():
+            events['first_fast_response'] = self._first_fast_response(stats, instance_id, threshold)
+            stages = [('launch', scale_out_time, events.get('launched')),
+                      ('boot_to_in_service', events.get('launched'), events.get('in_service')),
+                      ('in_service_to_healthy', events.get('in_service'), events.get('healthy')),
+                      ('healthy_to_fast_response', events.get('healthy'), events['first_fast_response'])]
+            
+            results[instance_id] = {
+                stage: (end - start) if start is not None and end is not None else None
+                for stage, start, end in stages
+            }
+            results[instance_id]['total'] = (
+                events['first_fast_response'] - scale_out_time
+                if events['first_fast_response'] is not None else None
+            )
+        
+        return {
+            'baseline_p95_response_time': threshold,
+            'instances': results
+        }
+    
+    def run_cold_start_benchmark(self, runs: int = 1, instances: int = 1, timeout: int = 900,
+                                 warmup: int = 60, poll_interval: int = 5) -> Dict:
+        """Benchmark launch -> InService -> healthy -> first fast response for new instances"""
+        logger.info("🧊 Starting Cold-Start Benchmark")
+        logger.info("=" * 50)
+        
+        run_results = []
+        for run in range(runs):
+            logger.info(f"Cold-start run {run + 1}/{runs}")
+            run_results.append(self._run_cold_start_once(instances, timeout, warmup, poll_interval))
+            
+            if run < runs - 1:
+                self._wait_for_capacity(self.get_current_capacity().get('desired', 0), timeout, poll_interval)
+        
+        # Aggregate each startup stage across all runs and instances
+        stage_names = ['launch', 'boot_to_in_service', 'in_service_to_healthy',
+                       'healthy_to_fast_response', 'total']
+        samples = {stage: [] for stage in stage_names}
+        for result in run_results:
+            for timings in result.get('instances', {}).values():
+                for stage in stage_names:
+                    if timings.get(stage) is not None:
+                        samples[stage].append(timings[stage])
+        
+        mean_total = statistics.mean(samples['total']) if samples['total'] else 0
+        breakdown = {}
+        for stage, values in samples.items():
+            if not values:
+                continue
+            breakdown[stage] = {
+                'count': len(values),
+                'mean_seconds': statistics.mean(values),
+                'median_seconds': statistics.median(values),
+                'max_seconds': max(values),
+                'share_of_total': (statistics.mean(values) / mean_total * 100) if mean_total and stage != 'total' else None
+            }
+        
+        expected = runs * instances
+        return {
+            'test_type': 'cold_start',
+            'timestamp': datetime.utcnow().isoformat(),
+            'runs': run_results,
+            'instances_per_run': instances,
+            'poll_interval': poll_interval,
+            'stage_breakdown': breakdown,
+            'success': len(samples['total']) >= expected
+        }
+    
+    def _wait_for_capacity(self, desired: int, timeout: int, poll_interval: int):
+        """Wait until the ASG has settled at the desired number of instances"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if len(self.get_asg_instances()) == desired:
+                return
+            time.sleep(poll_interval)
+        logger.warning(f"ASG did not settle at {desired} instances within {timeout} seconds")
+    
+    def run_policy_benchmark(self, policies: List[str], profile: List[float], backend: str = 'simulated',
+                             history_file: str = 'policy-benchmark-history.jsonl',
+                             instance_capacity_rps: float = 225, boot_seconds: int = 240,
+                             slo_p99: float = 0.5, instance_price: float = 0.0416,
+                             right_size_utilization: float = 70.0) -> Dict:
+        """Replay the same load profile against each scaling policy and compare the outcomes"""
+        logger.info("⚖️ Starting Scaling Policy Benchmark")
+        logger.info("=" * 50)
+        
+        profile_id = hashlib.sha1(json.dumps(profile).encode('utf-8')).hexdigest()[:12]
+        settings = {
+            'instance_capacity_rps': instance_capacity_rps,
+            'boot_seconds': boot_seconds,
+            'slo_p99': slo_p99,
+            'instance_price': instance_price,
+            'right_size_utilization': right_size_utilization
+        }
+        
+        if backend == 'live':
+            capacity = self.get_current_capacity()
+        else:
+            with open(os.path.join(REPO_ROOT, 'configurations', 'autoscaling-group.json')) as f:
+                asg_config = json.load(f)
+            capacity = {'min': asg_config['MinSize'], 'max': asg_config['MaxSize'],
+                        'desired': asg_config['DesiredCapacity']}
+        
+        results = {}
+        # Existing policies would scale the ASG alongside the one under test, so mute them for the run
+        suspended_alarms = self._suspend_existing_policies() if backend == 'live' else []
+        try:
+            for spec in policies:
+                policy = load_policy_config(spec)
+                logger.info(f"Benchmarking policy '{policy['name']}' ({backend}, {len(profile)}s profile)")
+                
+                invalid_steps = 0
+                if backend == 'live':
+                    records, invalid_steps = self._run_policy_live(policy, profile, capacity['desired'])
+                else:
+                    simulator = ScalingSimulator(capacity['min'], capacity['max'], capacity['desired'],
+                                                 instance_capacity_rps, boot_seconds)
+                    records = simulator.run(profile, self._policy_model(policy['config']))
+                
+                results[policy['name']] = self._score_policy_run(
+                    records, capacity['min'], instance_capacity_rps, slo_p99, instance_price, right_size_utilization
+                )
+                if backend == 'live':
+                    results[policy['name']]['invalid_load_steps'] = invalid_steps
+        finally:
+            if backend == 'live':
+                self.autoscaling.set_desired_capacity(
+                    AutoScalingGroupName=self.asg_name,
+                    DesiredCapacity=capacity['desired'],
+                    HonorCooldown=False
+                )
+                self._resume_existing_policies(suspended_alarms)
+        
+        # Compare with the latest stored run of each policy on the same profile and settings, then store this one
+        previous = self._load_benchmark_history(history_file, profile_id, backend, settings)
+        recorded_at = datetime.utcnow().isoformat()
+        with open(history_file, 'a') as f:
+            for name, metrics in results.items():
+                f.write(json.dumps({
+                    'recorded_at': recorded_at,
+                    'profile_id': profile_id,
+                    'backend': backend,
+                    'policy': name,
+                    'settings': settings,
+                    'metrics': metrics
+                }) + '\n')
+        
+        for line in self._format_policy_table(results, previous):
+            logger.info(line)
+        logger.info(f"Benchmark results appended to {history_file}")
+        
+        return {
+            'test_type': 'policy_benchmark',
+            'timestamp': recorded_at,
+            'backend': backend,
+            'profile_id': profile_id,
+            'profile_seconds': len(profile),
+            'settings': settings,
+            'policies': results,
+            'previous_runs': previous,
+            'success': all(m['requests_served'] > 0 for m in results.values())
+        }
+    
+    @staticmethod
+    def _policy_model(config: Dict):
+        """Build the simulated policy for a target tracking or step scaling configuration"""
+        if 'TargetValue' in config:
+            return TargetTrackingPolicy(config)
+        return StepScalingPolicy(config)
+    
+    def _run_policy_live(self, policy: Dict, profile: List[float], desired: int,
+                         poll_interval: int = 15) -> Tuple[List[Dict], int]:
+        """Apply a policy to the real ASG, replay the profile through the ALB and record the fleet"""
+        # Every policy starts from the same fleet size
+        self.autoscaling.set_desired_capacity(
+            AutoScalingGroupName=self.asg_name,
+            DesiredCapacity=desired,
+            HonorCooldown=False
+        )
+        self._wait_for_capacity(desired, 900, poll_interval)
+        
+        created = self._apply_policy(policy)
+        samples = []  # (time, in service, running)
+        step_starts = []  # (profile offset, actual start in seconds since the run started)
+        stop_event = threading.Event()
+        invalid_steps = 0
+        
+        def poll_capacity():
+            while not stop_event.is_set():
+                instances = self.get_asg_instances()
+                in_service = sum(1 for i in instances if i['LifecycleState'] == 'InService')
+                samples.append((time.time(), in_service, len(instances)))
+                stop_event.wait(poll_interval)
+        
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                poller = executor.submit(poll_capacity)
+                stats = LoadStats()
+                
+                # Steps start later than their profile offset (generator start-up, draining the last
+                # requests), so remember when each one really started relative to the run
+                offset = 0
+                for rps, duration in self._profile_steps(profile):
+                    if rps <= 0:
+                        step_starts.append((offset, time.time() - stats.start_time))
+                        time.sleep(duration)
+                    else:
+                        users = max(1, math.ceil(rps / 10))
+                        step_stats = self.run_load(duration, users, rps / users)
+                        step_starts.append((offset, step_stats.start_time - stats.start_time))
+                        stats.merge(step_stats)
+                        if not step_stats.generator_health['valid']:
+                            invalid_steps += 1
+                    offset += duration
+                
+                stop_event.set()
+                poller.result()
+        finally:
+            stop_event.set()
+            self._remove_policy(created)
+        
+        sample_times = [sample[0] for sample in samples]
+        step_offsets = [step[0] for step in step_starts]
+        records = []
+        for second, load in enumerate(profile):
+            step_offset, step_start = step_starts[max(0, bisect.bisect_right(step_offsets, second) - 1)]
+            actual = step_start + second - step_offset
+            
+            latency = LatencyHistogram()
+            served = failed = 0
+            for bucket in stats.timeline.get(int(actual), {}).values():
+                served += bucket['success']
+                failed += bucket['failed']
+                latency.merge(bucket['latency'])
+            
+            index = max(0, bisect.bisect_right(sample_times, stats.start_time + actual) - 1)
+            _, in_service, running = samples[index] if samples else (0, 0, 0)
+            records.append({
+                'second': second,
+                'load': load,
+                'served': served,
+                'failed': failed,
+                'p99': latency.percentile(99),
+                'in_service': in_service,
+                'running': running
+            })
+        
+        return records, invalid_steps
+    
+    @staticmethod
+    def _profile_steps(profile: List[float]) -> List[Tuple[float, int]]:
+        """Collapse a per-second profile into (rps, duration) steps"""
+        steps = []
+        for rps in profile:
+            if steps and steps[-1][0] == rps:
+                steps[-1][1] += 1
+            else:
+                steps.append([rps, 1])
+        return [(rps, duration) for rps, duration in steps]
+    
+    def _apply_policy(self, policy: Dict) -> Dict[str, List[str]]:
+        """Create the benchmark copy of a policy (and its alarms) on the ASG"""
+        config = policy['config']
+        created = {'policies': [], 'alarms': []}
+        
+        if 'TargetValue' in config:
+            name = f"XYZ-Benchmark-{policy['name']}"
+            self.autoscaling.put_scaling_policy(
+                AutoScalingGroupName=self.asg_name,
+                PolicyName=name,
+                PolicyType='TargetTrackingScaling',
+                TargetTrackingConfiguration={
+                    'TargetValue': config['TargetValue'],
+                    'PredefinedMetricSpecification': config['PredefinedMetricSpecification'],
+                    'DisableScaleIn': config.get('DisableScaleIn', False)
+                }
+            )
+            created['policies'].append(name)
+            return created
+        
+        policy_arns = {}
+        for key in ('ScaleUpPolicy', 'ScaleDownPolicy'):
+            step = config[key]
+            name = f"{step['PolicyName']}-Benchmark"
+            response = self.autoscaling.put_scaling_policy(
+                AutoScalingGroupName=self.asg_name,
+                PolicyName=name,
+                PolicyType='StepScaling',
+                AdjustmentType=step['AdjustmentType'],
+                StepAdjustments=step['StepAdjustments'],
+                MetricAggregationType=step['MetricAggregationType'],
+                EstimatedInstanceWarmup=step.get('Cooldown', 300)
+            )
+            policy_arns[key] = response['PolicyARN']
+            created['policies'].append(name)
+        
+        for alarm in config['CloudWatchAlarms']:
+            key = 'ScaleUpPolicy' if alarm['ComparisonOperator'].startswith('Greater') else 'ScaleDownPolicy'
+            name = f"{alarm['AlarmName']}-Benchmark"
+            self.cloudwatch.put_metric_alarm(
+                AlarmName=name,
+                AlarmDescription=alarm.get('AlarmDescription', ''),
+                ActionsEnabled=True,
+                AlarmActions=[policy_arns[key]],
+                MetricName=alarm['MetricName'],
+                Namespace=alarm['Namespace'],
+                Statistic=alarm['Statistic'],
+                Dimensions=[{'Name': 'AutoScalingGroupName', 'Value': self.asg_name}],
+                Period=alarm['Period'],
+                EvaluationPeriods=alarm['EvaluationPeriods'],
+                Threshold=alarm['Threshold'],
+                ComparisonOperator=alarm['ComparisonOperator'],
+                TreatMissingData=alarm.get('TreatMissingData', 'missing')
+            )
+            created['alarms'].append(name)
+        
+        return created
+    
+    def _suspend_existing_policies(self) -> List[str]:
+        """Disable the actions of alarms driving the ASG's existing policies; returns the alarms to re-enable"""
+        alarm_names = []
+        paginator = self.autoscaling.get_paginator('describe_policies')
+        for page in paginator.paginate(AutoScalingGroupName=self.asg_name):
+            for policy in page['ScalingPolicies']:
+                alarm_names.extend(alarm['AlarmName'] for alarm in policy.get('Alarms', []))
+        
+        # Leave alarms that were already disabled alone so restoring does not turn them on
+        suspended = []
+        for start in range(0, len(alarm_names), 100):
+            alarms = self.cloudwatch.describe_alarms(AlarmNames=alarm_names[start:start + 100])['MetricAlarms']
+            suspended.extend(alarm['AlarmName'] for alarm in alarms if alarm['ActionsEnabled'])
+        
+        for start in range(0, len(suspended), 100):
+            self.cloudwatch.disable_alarm_actions(AlarmNames=suspended[start:start + 100])
+        if suspended:
+            logger.info(f"Suspended {len(suspended)} alarms of existing scaling policies on {self.asg_name}")
+        return suspended
+    
+    def _resume_existing_policies(self, alarm_names: List[str]):
+        """Re-enable the alarm actions suspended for the benchmark"""
+        for start in range(0, len(alarm_names), 100):
+            try:
+                self.cloudwatch.enable_alarm_actions(AlarmNames=alarm_names[start:start + 100])
+            except Exception as e:
+                logger.error(f"Error re-enabling alarms {alarm_names[start:start + 100]}: {str(e)}")
+        if alarm_names:
+            logger.info(f"Restored {len(alarm_names)} alarms of existing scaling policies on {self.asg_name}")
+    
+    def _remove_policy(self, created: Dict[str, List[str]]):
+        """Delete the benchmark policies and alarms created for a run"""
+        try:
+            if created['alarms']:
+                self.cloudwatch.delete_alarms(AlarmNames=created['alarms'])
+            for name in created['policies']:
+                self.autoscaling.delete_policy(AutoScalingGroupName=self.asg_name, PolicyName=name)
+        except Exception as e:
+            logger.error(f"Error removing benchmark policy: {str(e)}")
+    
+    @staticmethod
+    def _score_policy_run(records: List[Dict], min_size: int, instance_capacity_rps: float,
+                          slo_p99: float, instance_price: float, right_size_utilization: float) -> Dict:
+        """Score a run: reaction time, latency, SLO violations, over-provisioning and cost"""
+        per_instance = instance_capacity_rps * right_size_utilization / 100
+        required = [max(min_size, math.ceil(r['load'] / per_instance)) for r in records]
+        short = [r['in_service'] < need for r, need in zip(records, required)]
+        
+        # Time from the first capacity shortfall until the fleet catches up
+        time_to_scale = None
+        first_short = next((i for i, is_short in enumerate(short) if is_short), None)
+        if first_short is not None:
+            recovered = next((i for i in range(first_short, len(short)) if not short[i]), None)
+            if recovered is not None:
+                time_to_scale = recovered - first_short
+        
+        # The ramp is wherever load is rising or capacity has not caught up yet
+        ramp_p99 = sorted(r['p99'] for i, r in enumerate(records)
+                          if short[i] or r['load'] > records[max(0, i - 60)]['load'])
+        
+        served = sum(r['served'] for r in records)
+        instance_hours = sum(r['running'] for r in records) / 3600
+        
+        return {
+            'time_to_scale_seconds': time_to_scale,
+            'under_provisioned_seconds': sum(short),
+            'p99_during_ramp': ramp_p99[max(0, math.ceil(len(ramp_p99) * 0.99) - 1)] if ramp_p99 else None,
+            'slo_violation_seconds': sum(1 for r in records if r['p99'] > slo_p99 or r['failed'] > 0),
+            'over_provisioned_instance_minutes': sum(
+                max(0, r['running'] - need) for r, need in zip(records, required)
+            ) / 60,
+            'instance_hours': instance_hours,
+            'cost_per_million_requests': (instance_hours * instance_price / served * 1e6) if served else None,
+            'requests_served': served,
+            'requests_failed': sum(r['failed'] for r in records),
+            'peak_instances': max((r['running'] for r in records), default=0)
+        }
+    
+    @staticmethod
+    def _load_benchmark_history(path: str, profile_id: str, backend: str, settings: Dict) -> Dict[str, Dict]:
+        """Get the latest stored result per policy for the same profile, backend and settings"""
+        previous = {}
+        if not os.path.exists(path):
+            return previous
+        
+        with open(path) as f:
+            for line in f:
+                entry = json.loads(line)
+                if (entry['profile_id'] == profile_id and entry['backend'] == backend
+                        and entry.get('settings') == settings):
+                    previous[entry['policy']] = entry
+        return previous
+    
+    @staticmethod
+    def _format_policy_table(results: Dict[str, Dict], previous: Dict[str, Dict]) -> List[str]:
+        """Format the policy comparison table, with the previous stored run under each policy"""
+        columns = [
+            ('Time-to-scale', 'time_to_scale_seconds', '{:.0f}s'),
+            ('p99 ramp', 'p99_during_ramp', '{:.3f}s'),
+            ('SLO viol.', 'slo_violation_seconds', '{:.0f}s'),
+            ('Over-prov.', 'over_provisioned_instance_minutes', '{:.1f} inst-min'),
+            ('$/M req', 'cost_per_million_requests', '${:.3f}')
+        ]
+        
+        def row(label, metrics):
+            cells = [fmt.format(metrics[key]) if metrics.get(key) is not None else 'n/a'
+                     for _, key, fmt in columns]
+            return f"{label:<24}" + ''.join(f"{cell:>18}" for cell in cells)
+        
+        lines = [f"{'Policy':<24}" + ''.join(f"{title:>18}" for title, _, _ in columns)]
+        for name, metrics in results.items():
+            lines.append(row(name, metrics))
+            if name in previous:
+                lines.append(row(f"  prev {previous[name]['recorded_at'][:16]}", previous[name]['metrics']))
+        return lines
+    
     def generate_test_report(self, test_results: List[Dict], filename: str = None) -> str:
         """Generate comprehensive test report"""
         if not filename:
@@ -412,7 +1980,8 @@ class AutoScalingTester:
                 'region': self.region,
                 'asg_name': self.asg_name,
                 'alb_dns': self.alb_dns,
-                'total_tests': len(test_results)
+                'total_tests': len(test_results),
+                'metric_data_api_calls': self.metrics.api_calls
             },
             'test_results': test_results,
             'summary': self._generate_summary(test_results)
@@ -436,7 +2005,7 @@ class AutoScalingTester:
         }
         
         # Add specific test type summaries
-        for test_type in ['scale_up', 'scale_down', 'stress_test']:
+        for test_type in ['scale_up', 'scale_down', 'stress_test', 'cold_start', 'policy_benchmark']:
             type_results = [r for r in test_results if r.get('test_type') == test_type]
             if type_results:
                 summary[f'{test_type}_results'] = {
@@ -456,6 +2025,30 @@ def main():
         default='us-east-1',
         help='AWS region (default: us-east-1)'
     )
+    parser.add_argument(
+        '--role',
+        choices=['coordinator', 'worker'],
+        default='coordinator',
+        help='Run tests (coordinator) or serve load for a remote coordinator (worker)'
+    )
+    parser.add_argument(
+        '--listen',
+        default='127.0.0.1:9200',
+        help='Address for worker mode to accept coordinators on (default: 127.0.0.1:9200)'
+    )
+    parser.add_argument(
+        '--workers',
+        help='Comma-separated host:port load workers; generate load on them instead of locally'
+    )
+    parser.add_argument(
+        '--worker-token',
+        default=os.environ.get('LOAD_WORKER_TOKEN'),
+        help='Shared secret between coordinator and workers (default: $LOAD_WORKER_TOKEN)'
+    )
+    parser.add_argument(
+        '--target-url',
+        help='Worker mode: only generate load against this URL (e.g. http://<alb-dns>/)'
+    )
     parser.add_argument(
         '--asg-name',
         default='XYZ-Corp-AutoScaling-Group',
@@ -467,7 +2060,7 @@ def main():
     )
     parser.add_argument(
         '--test-type',
-        choices=['scale-up', 'scale-down', 'stress', 'all'],
+        choices=['scale-up', 'scale-down', 'stress', 'cold-start', 'policy-benchmark', 'all'],
         default='all',
         help='Type of test to run (default: all)'
     )
@@ -481,14 +2074,108 @@ def main():
         '--report-file',
         help='Output report filename'
     )
+    parser.add_argument(
+        '--metrics-cache-ttl',
+        type=int,
+        default=60,
+        help='Seconds to reuse CloudWatch metric query results (default: 60)'
+    )
+    parser.add_argument(
+        '--timeline-window',
+        type=int,
+        default=10,
+        help='Seconds per window in the per-backend load timeline (default: 10)'
+    )
+    parser.add_argument(
+        '--rate-tolerance',
+        type=float,
+        default=10.0,
+        help='Percent below the target arrival rate before load results are flagged invalid (default: 10)'
+    )
+    parser.add_argument(
+        '--runs',
+        type=int,
+        default=1,
+        help='Number of cold-start benchmark runs to aggregate (default: 1)'
+    )
+    parser.add_argument(
+        '--cold-start-instances',
+        type=int,
+        default=1,
+        help='Instances to launch per cold-start run (default: 1)'
+    )
+    parser.add_argument(
+        '--policies',
+        default='target-tracking,step',
+        help='Comma-separated policies to benchmark: target-tracking, step or name=path.json'
+    )
+    parser.add_argument(
+        '--benchmark-backend',
+        choices=['simulated', 'live'],
+        default='simulated',
+        help='Replay the load profile in a simulated fleet or against the real ASG (default: simulated)'
+    )
+    parser.add_argument(
+        '--load-profile',
+        help='JSON load profile ({"steps": [{"duration": s, "rps": n}]}) or a previous test report'
+    )
+    parser.add_argument(
+        '--benchmark-history',
+        default='policy-benchmark-history.jsonl',
+        help='File that policy benchmark results are appended to (default: policy-benchmark-history.jsonl)'
+    )
+    parser.add_argument(
+        '--instance-capacity-rps',
+        type=float,
+        default=225,
+        help='Requests per second one instance serves at 100%% CPU (default: 225)'
+    )
+    parser.add_argument(
+        '--boot-seconds',
+        type=int,
+        default=240,
+        help='Simulated seconds from launch to serving traffic (default: 240)'
+    )
+    parser.add_argument(
+        '--slo-p99',
+        type=float,
+        default=0.5,
+        help='p99 latency SLO in seconds (default: 0.5)'
+    )
+    parser.add_argument(
+        '--instance-price',
+        type=float,
+        default=0.0416,
+        help='On-demand price per instance hour (default: 0.0416, t3.medium)'
+    )
     
     args = parser.parse_args()
     
+    if args.role == 'worker':
+        if not args.worker_token:
+            parser.error('worker mode requires --worker-token or LOAD_WORKER_TOKEN')
+        host, port = args.listen.rsplit(':', 1)
+        with LoadWorkerServer((host, int(port)), args.worker_token, args.target_url) as server:
+            logger.info(f"Load worker listening on {args.listen}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                logger.info("Received interrupt signal. Stopping...")
+        return 0
+    
+    if args.workers and not args.worker_token:
+        parser.error('--workers requires --worker-token or LOAD_WORKER_TOKEN')
+    
     # Initialize tester
     tester = AutoScalingTester(
         region=args.region,
         asg_name=args.asg_name,
-        alb_dns=args.alb_dns
+        alb_dns=args.alb_dns,
+        metrics_cache_ttl=args.metrics_cache_ttl,
+        timeline_window=args.timeline_window,
+        rate_tolerance=args.rate_tolerance,
+        remote_workers=args.workers.split(',') if args.workers else None,
+        worker_token=args.worker_token
     )
     
     # Check if ALB is available
@@ -525,9 +2212,35 @@ def main():
             test_results.append(result)
             logger.info("✅ Stress test completed")
         
+        if args.test_type == 'cold-start':
+            logger.info("Running cold-start benchmark...")
+            result = tester.run_cold_start_benchmark(
+                runs=args.runs,
+                instances=args.cold_start_instances,
+                timeout=args.duration * 3
+            )
+            test_results.append(result)
+            
+            for stage, timing in result['stage_breakdown'].items():
+                logger.info(f"  {stage}: mean {timing['mean_seconds']:.1f}s, max {timing['max_seconds']:.1f}s")
+        
+        if args.test_type == 'policy-benchmark':
+            logger.info("Running scaling policy benchmark...")
+            result = tester.run_policy_benchmark(
+                policies=args.policies.split(','),
+                profile=load_load_profile(args.load_profile),
+                backend=args.benchmark_backend,
+                history_file=args.benchmark_history,
+                instance_capacity_rps=args.instance_capacity_rps,
+                boot_seconds=args.boot_seconds,
+                slo_p99=args.slo_p99,
+                instance_price=args.instance_price
+            )
+            test_results.append(result)
+        
     except KeyboardInterrupt:
         logger.info("Test interrupted by user")
-        tester.load_test_active = False
+        tester.stop_load()
     except Exception as e:
         logger.error(f"Test failed with error: {str(e)}")
         return 1